@@ -0,0 +1,185 @@
+"""Active learning reliability with Kriging and Monte Carlo (AK-MCS)"""
+import numpy as np
+from scipy import linalg, optimize, stats
+from .evaluate import evaluate
+
+
+def akmcs(limit_state, X, num_samples=100000, num_initial=12,
+          learning='U', max_calls=200, refit=5, seed=None):
+    """Estimate the probability of failure with AK-MCS (Echard et al. 2011)
+
+    A Monte Carlo population is drawn in the standard normal space and a
+    Kriging surrogate of g is fitted to a few true limit state calls.
+    At each step the limit state is evaluated at the population point
+    where the sign of g is the most uncertain according to the learning
+    function, and the point is added to the surrogate:
+
+        'U': U = |mu|/sigma, the point with the smallest U is added and
+            the learning stops when min U >= 2
+        'EFF': expected feasibility, the point with the largest EFF is
+            added and the learning stops when max EFF <= 0.001
+
+    pf is the fraction of the population with negative Kriging mean.
+
+    Args:
+        limit_state (function): g(X_1, ..., X_n)
+        X (object): random variables attributes of the stochastic model
+        num_samples (int): size of the Monte Carlo population
+        num_initial (int): number of initial limit state calls
+        learning (str): 'U' or 'EFF'
+        max_calls (int): maximum number of limit state calls
+        refit (int): hyperparameters are fitted again after this number
+            of added points, in between the Cholesky factor is updated
+        seed: seed for the random number generator
+
+    Returns:
+        pf (float): probability of failure
+        cov (float): coefficient of variation of pf due to the population
+        num_calls (int): number of limit state calls
+    """
+    rng = np.random.default_rng(seed)
+    u = rng.standard_normal((num_samples, len(X.dist_func)))
+    chosen = rng.choice(num_samples, num_initial, replace=False)
+    g = evaluate(limit_state, X.to_physical(u[chosen]))
+    model = Kriging(u[chosen], g)
+    evaluated = np.zeros(num_samples, dtype=bool)
+    evaluated[chosen] = True
+
+    while True:
+        mu, sig = model.predict(u)
+        if learning == 'U':
+            score = np.abs(mu) / sig
+            # the sign is known at the points already evaluated
+            score[evaluated] = np.inf
+            best = int(np.argmin(score))
+            converged = score[best] >= 2
+        elif learning == 'EFF':
+            score = _expected_feasibility(mu, sig)
+            score[evaluated] = -np.inf
+            best = int(np.argmax(score))
+            converged = score[best] <= 1e-3
+        else:
+            raise ValueError('learning {} not implemented'.format(learning))
+        if converged or len(model.y) >= max_calls:
+            break
+
+        g_best = limit_state(*X.to_physical(u[best]))
+        evaluated[best] = True
+        if (len(model.y) - num_initial + 1) % refit == 0:
+            model = Kriging(np.vstack([model.x, u[best]]),
+                            np.append(model.y, g_best), model.theta)
+        else:
+            model.add(u[best], g_best)
+
+    pf = np.mean(mu < 0)
+    cov = np.sqrt((1 - pf) / (num_samples * pf)) if pf > 0 else np.inf
+    return pf, cov, len(model.y)
+
+
+def _expected_feasibility(mu, sig, a=0):
+    """Expected feasibility function with eps = 2 sigma"""
+    eps = 2 * sig
+    t = (a - mu) / sig
+    t_low, t_up = (a - eps - mu) / sig, (a + eps - mu) / sig
+    Phi, phi = stats.norm.cdf, stats.norm.pdf
+    return ((mu - a) * (2 * Phi(t) - Phi(t_low) - Phi(t_up))
+            - sig * (2 * phi(t) - phi(t_low) - phi(t_up))
+            + eps * (Phi(t_up) - Phi(t_low)))
+
+
+class Kriging(object):
+    """Ordinary Kriging with anisotropic Gaussian correlation
+
+        R(x, x') = exp(-sum_i theta_i (x_i - x'_i)**2)
+
+    The constant trend and process variance are estimated in closed form
+    and theta by maximum likelihood. Points are added with an update of
+    the Cholesky factor, keeping theta.
+
+    Args:
+        x (array): training points, each row is a point
+        y (array): function values at the training points
+        theta (array): initial guess of theta
+        nugget (float): added to the diagonal for conditioning
+    """
+    def __init__(self, x, y, theta=None, nugget=1e-10):
+        self.x = np.array(x, dtype=float)
+        self.y = np.array(y, dtype=float)
+        self.nugget = nugget
+        n = self.x.shape[1]
+        theta = np.full(n, .5) if theta is None else theta
+
+        result = optimize.minimize(
+            lambda log_theta: self._neg_likelihood(np.exp(log_theta)),
+            np.log(theta), method='L-BFGS-B',
+            bounds=[(np.log(1e-4), np.log(1e2))] * n)
+        self.theta = np.exp(result.x)
+        self._factor()
+
+    def _correlation(self, a, b):
+        d = a[:, None, :] - b[None, :, :]
+        return np.exp(-np.einsum('ijk,k->ij', d**2, self.theta))
+
+    def _neg_likelihood(self, theta):
+        self.theta = theta
+        try:
+            self._factor()
+        except linalg.LinAlgError:
+            return np.inf
+        m = len(self.y)
+        return (m * np.log(self.sigma2)
+                + 2 * np.sum(np.log(np.diag(self.L))))
+
+    def _factor(self):
+        K = self._correlation(self.x, self.x)
+        K[np.diag_indices_from(K)] += self.nugget
+        self.L = linalg.cholesky(K, lower=True)
+        self._solve()
+
+    def _solve(self):
+        """Trend, process variance and weights from the Cholesky factor"""
+        ones = np.ones(len(self.y))
+        self._Linv_1 = linalg.solve_triangular(self.L, ones, lower=True)
+        Linv_y = linalg.solve_triangular(self.L, self.y, lower=True)
+        self.beta = (self._Linv_1 @ Linv_y) / (self._Linv_1 @ self._Linv_1)
+        residual = Linv_y - self.beta * self._Linv_1
+        self.sigma2 = max(residual @ residual / len(self.y), 1e-300)
+        self._alpha = linalg.solve_triangular(self.L.T, residual, lower=False)
+
+    def add(self, x, y):
+        """Add a training point with a rank one update of the factor"""
+        k = self._correlation(np.atleast_2d(x), self.x)[0]
+        l = linalg.solve_triangular(self.L, k, lower=True)
+        d = np.sqrt(max(1 + self.nugget - l @ l, self.nugget))
+        m = len(self.y)
+        L = np.zeros((m + 1, m + 1))
+        L[:m, :m] = self.L
+        L[m, :m] = l
+        L[m, m] = d
+        self.L = L
+        self.x = np.vstack([self.x, x])
+        self.y = np.append(self.y, y)
+        self._solve()
+
+    def predict(self, x, chunk_size=10000):
+        """Kriging mean and standard deviation at each row of x
+
+        Args:
+            x (array): points, each row is a point
+            chunk_size (int): number of points predicted at once
+
+        Returns:
+            mu (array): mean
+            sig (array): standard deviation
+        """
+        mu, sig = np.empty(len(x)), np.empty(len(x))
+        one_K_one = self._Linv_1 @ self._Linv_1
+        for start in range(0, len(x), chunk_size):
+            stop = start + chunk_size
+            r = self._correlation(x[start:stop], self.x)
+            mu[start:stop] = self.beta + r @ self._alpha
+            Linv_r = linalg.solve_triangular(self.L, r.T, lower=True)
+            var = (1 - np.sum(Linv_r**2, axis=0)
+                   + (1 - self._Linv_1 @ Linv_r)**2 / one_K_one)
+            sig[start:stop] = np.sqrt(np.maximum(self.sigma2 * var, 1e-300))
+        return mu, sig
@@ -0,0 +1,339 @@
+"""Benchmark of the reliability solvers on standard test problems
+
+Run from the command line with
+
+    python -m pyrisk.benchmark --output results.json
+
+Each record has the problem, solver, wall time, number of limit state
+calls, peak memory and the error of beta and pf against the reference
+probability of failure of the problem. The montecarlo samplers are
+timed on their own, with the error of the sample mean and standard
+deviation.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+import numpy as np
+from scipy import stats
+from . import montecarlo
+from .evaluate import CountedLimitState
+from .form_hl import form_hl
+from .form_hlrf_choi import form_hlrf_choi
+from .form_hlrf_correlation import form_hlrf_correlation
+from .form_hlrf_nowak import form_hlrf_nowak
+from .form_ihlrf import form_ihlrf
+from .stochastic_model import StochasticModel
+
+
+class Problem(object):
+    """Reliability test problem
+
+    Args:
+        name (str): name of the problem
+        limit_state (function): g(X_1, ..., X_n)
+        X (object): random variables attributes of the stochastic model
+        pf (float): reference probability of failure
+        var_func (function): inverse function to ensure g(x)=0, needed by
+            form_hl and form_hlrf_nowak
+    """
+    def __init__(self, name, limit_state, X, pf, var_func=None):
+        self.name = name
+        self.limit_state = limit_state
+        self.X = X
+        self.pf = pf
+        self.var_func = var_func
+
+    @property
+    def beta(self):
+        """Generalized reliability index -Phi^{-1}(pf)"""
+        return - stats.norm.ppf(self.pf)
+
+
+def choi_linear(x1, x2, x3):
+    """From choi 2007 p. 224"""
+    return x1 - x2 - 2*x3
+
+
+def cubic(x1, x2):
+    return x1**3 + x2**3 - 18
+
+
+def nowak_beam(x1, x2, x3):
+    L = 5
+    return 1/360 - 0.00694*x3*L**4/(x2*x1)
+
+
+def nowak_beam_var_func(x1, x2, x3):
+    L = 5
+    return x2*x1/(L**4 * 360 * 0.00694)
+
+
+def series(*x):
+    """Parallel planes at distances 3 and 3.5 of the origin in any
+    dimension, pf = Phi(-3) + Phi(-3.5)"""
+    s = sum(x) / np.sqrt(len(x))
+    return np.minimum(3 - s, 3.5 + s)
+
+
+def four_branch(x1, x2):
+    """Waarts (2000) series system with four branches, k = 7"""
+    a = 3 + .1*(x1 - x2)**2 - (x1 + x2)/np.sqrt(2)
+    b = 3 + .1*(x1 - x2)**2 + (x1 + x2)/np.sqrt(2)
+    c = (x1 - x2) + 7/np.sqrt(2)
+    d = (x2 - x1) + 7/np.sqrt(2)
+    return np.minimum(np.minimum(a, b), np.minimum(c, d))
+
+
+def highly_nonlinear(x1, x2):
+    """Der Kiureghian and Dakessian (1998), FORM overestimates pf"""
+    return 3 - x2 + (4*x1)**4
+
+
+def problems():
+    """Library of test problems with their reference pf
+
+    The references are exact (series), from one dimensional quadrature
+    (cubic, highly nonlinear), directional integration (four branch) or
+    conditional Monte Carlo with 2 10**7 samples (Nowak beam).
+
+    Returns:
+        problems (dict): {name: Problem}
+    """
+    standard = ['norm', 0, 1]
+    library = [
+        Problem('choi_linear', choi_linear,
+                StochasticModel(['norm', 50, 5],
+                                ['norm', 10, 2],
+                                ['norm', 15, 3]),
+                stats.norm.cdf(-10 / np.sqrt(65))),
+        Problem('cubic', cubic,
+                StochasticModel(['norm', 10, 5],
+                                ['norm', 10, 5]),
+                5.48762e-3),
+        Problem('nowak_beam', nowak_beam,
+                StochasticModel(['norm', 8e-4, 1.4e-4],
+                                ['norm', 2e7, .5e7],
+                                ['norm', 10, .4]),
+                .49472, nowak_beam_var_func),
+        Problem('series_2d', series, StochasticModel(*[standard] * 2),
+                stats.norm.cdf(-3) + stats.norm.cdf(-3.5)),
+        Problem('series_10d', series, StochasticModel(*[standard] * 10),
+                stats.norm.cdf(-3) + stats.norm.cdf(-3.5)),
+        Problem('series_100d', series, StochasticModel(*[standard] * 100),
+                stats.norm.cdf(-3) + stats.norm.cdf(-3.5)),
+        Problem('four_branch', four_branch, StochasticModel(*[standard] * 2),
+                2.22280e-3),
+        Problem('highly_nonlinear', highly_nonlinear,
+                StochasticModel(*[standard] * 2), 1.78159e-4),
+    ]
+    return {p.name: p for p in library}
+
+
+class _BudgetExceeded(Exception):
+    """The solver called the limit state more than max_calls times"""
+
+
+class _Budget(CountedLimitState):
+    """Counted limit state that stops solvers that do not converge"""
+    def __init__(self, limit_state, max_calls):
+        super().__init__(limit_state)
+        self.max_calls = max_calls
+
+    def __call__(self, *x):
+        g = super().__call__(*x)
+        if self.count > self.max_calls:
+            raise _BudgetExceeded(
+                'more than {} limit state calls'.format(self.max_calls))
+        return g
+
+
+def _form_hl(p, g, num_simulations, seed):
+    return form_hl(g, p.X.mean, p.X.std, p.var_func)[1]
+
+
+def _form_hlrf_nowak(p, g, num_simulations, seed):
+    return form_hlrf_nowak(g, p.X, p.var_func)[1]
+
+
+def _form_hlrf_choi(p, g, num_simulations, seed):
+    return form_hlrf_choi(g, p.X)[1]
+
+
+def _form_hlrf_correlation(p, g, num_simulations, seed):
+    return form_hlrf_correlation(g, p.X)[1]
+
+
+def _form_ihlrf(p, g, num_simulations, seed):
+    return form_ihlrf(g, p.X).beta
+
+
+def _montecarlo(p, g, num_simulations, seed):
+    return montecarlo.failure_probability(g, p.X, num_simulations,
+                                          seed=seed)[0]
+
+
+def _montecarlo_sobol(p, g, num_simulations, seed):
+    return montecarlo.failure_probability(g, p.X, num_simulations,
+                                          seed=seed, method='sobol')[0]
+
+
+# name: (function returning beta or pf, result is beta, needs var_func)
+solvers = {'form_hl': (_form_hl, True, True),
+           'form_hlrf_nowak': (_form_hlrf_nowak, True, True),
+           'form_hlrf_choi': (_form_hlrf_choi, True, False),
+           'form_hlrf_correlation': (_form_hlrf_correlation, True, False),
+           'form_ihlrf': (_form_ihlrf, True, False),
+           'montecarlo': (_montecarlo, False, False),
+           'montecarlo_sobol': (_montecarlo_sobol, False, False)}
+
+
+def _normal(num_simulations, seed):
+    return montecarlo.normal(num_simulations, 10, 3, rng=seed)
+
+
+def _lognormal(num_simulations, seed):
+    return montecarlo.lognormal(num_simulations, 10, 3, rng=seed)
+
+
+def _gumbel_r(num_simulations, seed):
+    return montecarlo.gumbel_r(num_simulations, 10, 3, rng=seed)
+
+
+def _correlated(num_simulations, seed):
+    cov = 9 * np.array([[1, .5, .2],
+                        [.5, 1, .3],
+                        [.2, .3, 1]])
+    return montecarlo.correlated(['norm', 10, 3], ['lognorm', 10, 3],
+                                 ['gumbel_r', 10, 3], cov=cov,
+                                 num_simulations=num_simulations, rng=seed)
+
+
+# name: (function returning the samples, mean, std)
+samplers = {'normal': (_normal, 10, 3),
+            'lognormal': (_lognormal, 10, 3),
+            'gumbel_r': (_gumbel_r, 10, 3),
+            'correlated': (_correlated, 10, 3)}
+
+
+def run(problem_names=None, solver_names=None, num_simulations=2**17,
+        seed=0, max_calls=10**5, memory=True, sampler_names=None):
+    """Run the solvers on the problems and time the samplers
+
+    Each solver is timed on its own, and run a second time under
+    tracemalloc for the peak memory if memory is True. Solvers that need
+    var_func are skipped for the problems without it. FORM solvers that
+    exceed max_calls, e.g. oscillating without converging, solvers that
+    raise and results that are not finite are recorded with an error
+    message. The samplers draw num_simulations samples with seed.
+
+    Args:
+        problem_names (list): names in problems() or Problem objects,
+            None for all
+        solver_names (list): names in solvers, None for all
+        num_simulations: number of samples of the Monte Carlo solvers
+            and of the samplers
+        seed: seed of the Monte Carlo solvers and of the samplers
+        max_calls: maximum number of limit state calls of a FORM solver
+        memory (bool): measure the peak memory
+        sampler_names (list): names in samplers, None for all
+
+    Returns:
+        records (list): one dict for each problem and solver, then one
+            for each sampler
+    """
+    library = problems()
+    problem_names = problem_names or list(library)
+    solver_names = solver_names or list(solvers)
+    if sampler_names is None:
+        sampler_names = list(samplers)
+
+    records = []
+    for problem in (library[p] if isinstance(p, str) else p
+                    for p in problem_names):
+        for name in solver_names:
+            solver, returns_beta, needs_var_func = solvers[name]
+            if needs_var_func and problem.var_func is None:
+                continue
+            record = {'problem': problem.name, 'solver': name,
+                      'dimension': len(problem.X.dist_func),
+                      'beta_ref': float(problem.beta),
+                      'pf_ref': float(problem.pf)}
+
+            g = _Budget(problem.limit_state,
+                        max_calls if returns_beta else np.inf)
+            start = time.perf_counter()
+            try:
+                result = solver(problem, g, num_simulations, seed)
+            except (_BudgetExceeded, ArithmeticError, ValueError) as error:
+                record.update(error=str(error), calls=g.count)
+                records.append(record)
+                continue
+            record['time'] = time.perf_counter() - start
+            record['calls'] = g.count
+            if not np.isfinite(result):
+                record['error'] = 'result is not finite'
+                records.append(record)
+                continue
+
+            if memory:
+                tracemalloc.start()
+                solver(problem, problem.limit_state, num_simulations, seed)
+                record['peak_memory'] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+            if returns_beta:
+                beta, pf = float(result), float(stats.norm.cdf(-result))
+            else:
+                beta, pf = float(- stats.norm.ppf(result)), float(result)
+            record.update(beta=beta, pf=pf,
+                          beta_error=abs(beta - problem.beta) / problem.beta,
+                          pf_error=abs(pf - problem.pf) / problem.pf)
+            records.append(record)
+
+    for name in sampler_names:
+        sampler, mean, std = samplers[name]
+        record = {'sampler': name, 'num_simulations': num_simulations}
+        start = time.perf_counter()
+        x = sampler(num_simulations, seed)
+        record['time'] = time.perf_counter() - start
+        if memory:
+            tracemalloc.start()
+            sampler(num_simulations, seed)
+            record['peak_memory'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        record.update(
+            mean_error=float(np.max(abs(x.mean(axis=0) - mean)) / mean),
+            std_error=float(np.max(abs(x.std(axis=0) - std)) / std))
+        records.append(record)
+    return records
+
+
+def main(argv=None):
+    """Command line interface, writes the records as JSON"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--problems', nargs='+', choices=list(problems()))
+    parser.add_argument('--solvers', nargs='+', choices=list(solvers))
+    parser.add_argument('--samplers', nargs='*', choices=list(samplers),
+                        help='all if omitted, none if empty')
+    parser.add_argument('--num-simulations', type=int, default=2**17)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-calls', type=int, default=10**5)
+    parser.add_argument('--no-memory', action='store_true',
+                        help='do not measure the peak memory')
+    parser.add_argument('--output', help='JSON file, stdout if omitted')
+    args = parser.parse_args(argv)
+
+    records = run(args.problems, args.solvers, args.num_simulations,
+                  args.seed, args.max_calls, not args.no_memory,
+                  args.samplers)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(records, f, indent=1)
+    else:
+        print(json.dumps(records, indent=1))
+    return records
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Memoizing wrapper for expensive limit state functions"""
+from collections import OrderedDict
+import sqlite3
+import numpy as np
+from .evaluate import evaluate
+
+
+class CachedLimitState(object):
+    """Limit state that remembers the points it was evaluated at
+
+    The wrapper is called as the limit state, g(X_1, ..., X_n), and can
+    be passed to any algorithm instead of it. Points already evaluated
+    are taken from the cache. If called with arrays, the points missing
+    in the cache are evaluated in one call, see evaluate.
+
+    Points are compared after quantization, x / quantum rounded to an
+    integer, so points closer than quantum share the same value. Without
+    quantum points are compared exactly.
+
+    Args:
+        limit_state (function): g(X_1, ..., X_n)
+        quantum (float or array): resolution of the key of each variable
+        maxsize (int): maximum number of points kept in memory, the least
+            recently used are discarded. None for no limit
+        path (str): sqlite file where the values are stored, so they are
+            reused by later analyses
+
+    Attributes:
+        hits (int): number of values taken from the cache
+        misses (int): number of limit state evaluations
+    """
+    def __init__(self, limit_state, quantum=None, maxsize=None, path=None):
+        self.limit_state = limit_state
+        self.quantum = quantum
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._db = None
+
+    def __call__(self, *x):
+        if all(np.ndim(xi) == 0 for xi in x):
+            return self._evaluate(np.array([x], dtype=float))[0]
+        points = np.column_stack(np.broadcast_arrays(*x)).astype(float)
+        return self._evaluate(points)
+
+    def _evaluate(self, points):
+        """Values at each row of points, evaluating the misses at once"""
+        keys = [self._key(p) for p in points]
+        g = np.empty(len(points))
+        missing = {}
+        for i, key in enumerate(keys):
+            value = self._lookup(key)
+            if value is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                g[i] = value
+                self.hits += 1
+
+        if missing:
+            rows = [index[0] for index in missing.values()]
+            values = evaluate(self.limit_state, points[rows])
+            self.misses += len(rows)
+            self.hits += sum(len(index) - 1 for index in missing.values())
+            for (key, index), value in zip(missing.items(), values):
+                g[index] = value
+                self._store(key, value)
+            if self.path is not None:
+                self._connection().commit()
+        return g
+
+    def _key(self, point):
+        if self.quantum is None:
+            return point.tobytes()
+        return np.round(point / self.quantum).astype(np.int64).tobytes()
+
+    def _lookup(self, key):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        if self.path is not None:
+            row = self._connection().execute(
+                'SELECT value FROM cache WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                self._remember(key, row[0])
+                return row[0]
+        return None
+
+    def _store(self, key, value):
+        self._remember(key, float(value))
+        if self.path is not None:
+            self._connection().execute(
+                'INSERT OR REPLACE INTO cache VALUES (?, ?)',
+                (key, float(value)))
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        if self.maxsize is not None and len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _connection(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.path)
+            self._db.execute('CREATE TABLE IF NOT EXISTS cache '
+                             '(key BLOB PRIMARY KEY, value REAL)')
+        return self._db
+
+    def clear(self):
+        """Discard the values kept in memory and reset the statistics"""
+        self._memory.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        # the sqlite connection can not be sent to other processes
+        state = self.__dict__.copy()
+        state['_db'] = None
+        return state
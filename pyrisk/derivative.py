@@ -1,8 +1,14 @@
-"""Computes derivative with finite differences"""
+"""Computes derivative with finite differences
+
+All functions with the signature gradient(func, points, g0=None) can be
+used as gradient provider of the FORM algorithms, g0 is func(*points)
+when it is already known.
+"""
 import numpy as np
+from .evaluate import evaluate
 
 
-def derivative(func, points, eps=1e-8):
+def derivative(func, points, eps=1e-8, g0=None):
     """Compute derivative of func at points using finite differences
     
        ddx = \\frac{func(points + eps) - func(points - eps)}{2 * eps}
@@ -10,6 +16,7 @@ def derivative(func, points, eps=1e-8):
     Args:
         func (function): function with N parameters
         points (array): array with N-dimension
+        g0 (float): not used, accepted for the gradient provider signature
 
     Returns:
         derivative: list with derivative
@@ -27,3 +34,135 @@ def derivative(func, points, eps=1e-8):
         d.append((func(*step_up) - func(*step_down))/(2*eps))
 
     return np.array(d)
+
+
+def batched(func, points, eps=1e-6, g0=None):
+    """Central differences with all 2N points evaluated in one call
+
+    The perturbed points are stacked in a (2N, N) array and func is
+    called once with its columns, see evaluate.
+
+    Args:
+        func (function): function with N parameters
+        points (array): array with N-dimension
+        eps (float): step
+        g0 (float): not used, accepted for the gradient provider signature
+
+    Returns:
+        derivative (array): partial derivatives of func at points
+    """
+    points = np.asarray(points, dtype=float)
+    step = eps * np.identity(len(points))
+    g = evaluate(func, np.vstack([points + step, points - step]))
+    return (g[:len(points)] - g[len(points):]) / (2 * eps)
+
+
+def forward(func, points, eps=1e-8, g0=None):
+    """Forward differences reusing func(*points)
+
+       ddx = \\frac{func(points + eps) - g0}{eps}
+
+    The N perturbed points are evaluated in one call, see evaluate.
+
+    Args:
+        func (function): function with N parameters
+        points (array): array with N-dimension
+        eps (float): step
+        g0 (float): func(*points), computed if None
+
+    Returns:
+        derivative (array): partial derivatives of func at points
+    """
+    points = np.asarray(points, dtype=float)
+    if g0 is None:
+        g0 = func(*points)
+    g = evaluate(func, points + eps * np.identity(len(points)))
+    return (g - g0) / eps
+
+
+def complex_step(func, points, h=1e-20, g0=None):
+    """Complex step derivative
+
+       ddx = \\frac{Im(func(points + i h))}{h}
+
+    There is no subtraction, so h can be tiny and the derivative is exact
+    to machine precision. func must accept complex arguments, e.g. be
+    written with NumPy operations and without abs or comparisons.
+
+    Args:
+        func (function): function with N parameters
+        points (array): array with N-dimension
+        h (float): imaginary step
+        g0 (float): not used, accepted for the gradient provider signature
+
+    Returns:
+        derivative (array): partial derivatives of func at points
+    """
+    points = np.asarray(points, dtype=float)
+    steps = points + 1j * h * np.identity(len(points))
+    try:
+        g = np.asarray(func(*steps.T))
+    except Exception:
+        g = None
+    if g is None or g.shape != (len(points),):
+        g = np.array([func(*p) for p in steps])
+    return np.imag(g) / h
+
+
+def analytic(grad):
+    """Use a user supplied gradient as gradient provider
+
+    Args:
+        grad (function): grad(X_1, ..., X_n) returning the N partial
+            derivatives of the limit state
+
+    Returns:
+        gradient (function): gradient provider
+    """
+    def gradient(func, points, g0=None):
+        return np.asarray(grad(*points), dtype=float)
+    return gradient
+
+
+def hessian(func, points, eps=1e-4, g0=None):
+    """Second derivatives with central differences in one call
+
+       H_ii = (f(x + h_i) - 2 f(x) + f(x - h_i)) / h_i**2
+       H_ij = (f(x + h_i + h_j) - f(x + h_i - h_j) - f(x - h_i + h_j)
+               + f(x - h_i - h_j)) / (4 h_i h_j)
+
+    All 2N**2 points, and x if g0 is None, are stacked and evaluated at
+    once, see evaluate.
+
+    Args:
+        func (function): function with N parameters
+        points (array): array with N-dimension
+        eps (float or array): step of each variable
+        g0 (float): func(*points), computed if None
+
+    Returns:
+        hessian (array): (N, N) second derivatives of func at points
+        derivative (array): first derivatives from the same evaluations
+        g0 (float): func(*points)
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    h = np.broadcast_to(np.asarray(eps, dtype=float), (n,))
+    step = np.diag(h)
+    i, j = np.triu_indices(n, 1)
+    stacked = np.vstack([points + step, points - step,
+                         points + step[i] + step[j],
+                         points + step[i] - step[j],
+                         points - step[i] + step[j],
+                         points - step[i] - step[j]])
+    if g0 is None:
+        g = evaluate(func, np.vstack([points[None], stacked]))
+        g0, g = g[0], g[1:]
+    else:
+        g = evaluate(func, stacked)
+    up, down = g[:n], g[n:2 * n]
+    pp, pm, mp, mm = np.split(g[2 * n:], 4)
+
+    H = np.diag((up - 2 * g0 + down) / h**2)
+    H[i, j] = H[j, i] = (pp - pm - mp + mm) / (4 * h[i] * h[j])
+    return H, (up - down) / (2 * h), g0
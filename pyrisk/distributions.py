@@ -0,0 +1,218 @@
+"""Closed form distributions parametrized by mean and standard deviation
+
+The pdf, cdf and ppf are written with NumPy and scipy.special ufuncs,
+which avoids the per call overhead of the scipy frozen distributions.
+The parameters may be arrays, e.g. one entry for each variable of the
+same family in a StochasticModel.
+"""
+import numpy as np
+from scipy import special
+from .evaluate import evaluate
+
+
+class Normal(object):
+    """Normal distribution N(mu, sig)"""
+    def __init__(self, mu, sig):
+        self.mu = np.asarray(mu, dtype=float)
+        self.sig = np.asarray(sig, dtype=float)
+
+    def pdf(self, x):
+        z = (x - self.mu) / self.sig
+        return np.exp(-z**2 / 2) / (np.sqrt(2 * np.pi) * self.sig)
+
+    def logpdf(self, x):
+        z = (x - self.mu) / self.sig
+        return -z**2 / 2 - np.log(np.sqrt(2 * np.pi) * self.sig)
+
+    def cdf(self, x):
+        return special.ndtr((x - self.mu) / self.sig)
+
+    def sf(self, x):
+        return special.ndtr((self.mu - x) / self.sig)
+
+    def ppf(self, p):
+        return self.mu + self.sig * special.ndtri(p)
+
+    def isf(self, p):
+        return self.mu - self.sig * special.ndtri(p)
+
+    def mean(self):
+        return self.mu
+
+    def std(self):
+        return self.sig
+
+    def sample(self, num_simulations, rng=None):
+        """Samples drawn directly with Generator.standard_normal"""
+        rng = np.random.default_rng(rng)
+        z = rng.standard_normal((num_simulations,) + self.mu.shape)
+        return self.mu + self.sig * z
+
+
+class Lognormal(object):
+    """Lognormal distribution LN(mu, sig)
+
+    ln(X) -> N(mu_ln, sig_ln) with,
+
+        sig_ln = sqrt(ln(sig**2/mu**2 + 1))
+        mu_ln = ln(mu) - 0.5 * sig_ln**2
+    """
+    def __init__(self, mu, sig):
+        self.mu = np.asarray(mu, dtype=float)
+        self.sig = np.asarray(sig, dtype=float)
+        self.sig_ln = np.sqrt(np.log(self.sig**2 / self.mu**2 + 1))
+        self.mu_ln = np.log(self.mu) - .5 * self.sig_ln**2
+
+    def _z(self, x):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (np.log(np.maximum(x, 0)) - self.mu_ln) / self.sig_ln
+
+    def pdf(self, x):
+        z = self._z(x)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            f = np.exp(-z**2 / 2) / (np.sqrt(2 * np.pi) * self.sig_ln * x)
+        return np.where(x > 0, f, 0.)
+
+    def logpdf(self, x):
+        z = self._z(x)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            logf = (-z**2 / 2
+                    - np.log(np.sqrt(2 * np.pi) * self.sig_ln * x))
+        return np.where(x > 0, logf, -np.inf)
+
+    def cdf(self, x):
+        return special.ndtr(self._z(x))
+
+    def sf(self, x):
+        return special.ndtr(-self._z(x))
+
+    def ppf(self, p):
+        return np.exp(self.mu_ln + self.sig_ln * special.ndtri(p))
+
+    def isf(self, p):
+        return np.exp(self.mu_ln - self.sig_ln * special.ndtri(p))
+
+    def mean(self):
+        return self.mu
+
+    def std(self):
+        return self.sig
+
+    def sample(self, num_simulations, rng=None):
+        """Samples as the exponential of Generator.standard_normal draws"""
+        rng = np.random.default_rng(rng)
+        z = rng.standard_normal((num_simulations,) + self.mu.shape)
+        return np.exp(self.mu_ln + self.sig_ln * z)
+
+
+class Gumbel(object):
+    """Gumbel right skewed, aka extreme type I, distribution
+
+        F(x) = exp(-exp(-(x - loc)/scale))
+
+    with 1/scale = sqrt(pi**2/(6*sig**2)) and loc = mu - 0.5772 scale.
+    """
+    def __init__(self, mu, sig):
+        self.mu = np.asarray(mu, dtype=float)
+        self.sig = np.asarray(sig, dtype=float)
+        self.scale = 1 / np.sqrt(np.pi**2 / (6 * self.sig**2))
+        self.loc = self.mu - 0.5772 * self.scale
+
+    def pdf(self, x):
+        y = (x - self.loc) / self.scale
+        return np.exp(-y - np.exp(-y)) / self.scale
+
+    def logpdf(self, x):
+        y = (x - self.loc) / self.scale
+        return -y - np.exp(-y) - np.log(self.scale)
+
+    def cdf(self, x):
+        return np.exp(-np.exp(-(x - self.loc) / self.scale))
+
+    def sf(self, x):
+        return -np.expm1(-np.exp(-(x - self.loc) / self.scale))
+
+    def ppf(self, p):
+        return self.loc - self.scale * np.log(-np.log(p))
+
+    def isf(self, p):
+        return self.loc - self.scale * np.log(-np.log1p(-p))
+
+    def mean(self):
+        return self.loc + 0.5772 * self.scale
+
+    def std(self):
+        return np.pi * self.scale / np.sqrt(6)
+
+    def sample(self, num_simulations, rng=None):
+        rng = np.random.default_rng(rng)
+        return rng.gumbel(self.loc, self.scale,
+                          (num_simulations,) + self.mu.shape)
+
+
+families = {'norm': Normal, 'lognorm': Lognormal, 'gumbel_r': Gumbel}
+
+
+class Tabulated(object):
+    """Distribution tabulated from a pdf on a finite interval
+
+    The pdf is evaluated once on a grid and accumulated with the
+    trapezoidal rule in one pass. The cdf and its inverse are linear
+    interpolations of the table, so sampling by inverse transform costs
+    one np.interp call.
+
+    Tabulated distributions may be used as marginals of a
+    StochasticModel, e.g. StochasticModel([Tabulated(func, [a, b])]).
+
+    Args:
+        func (function): pdf f(x), normalized by the table if needed
+        interval (list): [a, b] support of the pdf
+        num_points (int): number of points of the table
+
+    Attributes:
+        x (array): abscissae of the table
+        F (array): cdf at x
+        total (float): integral of func over the interval
+    """
+    def __init__(self, func, interval, num_points=2001):
+        self.x = np.linspace(interval[0], interval[1], num_points)
+        f = evaluate(func, self.x[:, None])
+        F = np.concatenate(
+            [[0], np.cumsum((f[1:] + f[:-1]) / 2 * np.diff(self.x))])
+        self.total = F[-1]
+        self.f = f / self.total
+        self.F = F / self.total
+
+    def pdf(self, x):
+        return np.interp(x, self.x, self.f, left=0, right=0)
+
+    def logpdf(self, x):
+        with np.errstate(divide='ignore'):
+            return np.log(self.pdf(x))
+
+    def cdf(self, x):
+        return np.interp(x, self.x, self.F, left=0, right=1)
+
+    def sf(self, x):
+        return 1 - self.cdf(x)
+
+    def ppf(self, p):
+        return np.interp(p, self.F, self.x)
+
+    def isf(self, p):
+        return self.ppf(1 - np.asarray(p))
+
+    def mean(self):
+        return _trapezoid(self.x * self.f, self.x)
+
+    def std(self):
+        return np.sqrt(_trapezoid((self.x - self.mean())**2 * self.f, self.x))
+
+    def sample(self, num_simulations, rng=None):
+        """Samples by inverse transform of Generator.random draws"""
+        rng = np.random.default_rng(rng)
+        return self.ppf(rng.random(num_simulations))
+
+
+def _trapezoid(y, x):
+    return np.sum((y[1:] + y[:-1]) / 2 * np.diff(x))
@@ -0,0 +1,54 @@
+"""Evaluates a limit state on a batch of points"""
+import numpy as np
+
+
+def evaluate(func, points):
+    """Evaluate func at each row of points
+
+    func is first called once with whole columns,
+    func(x1_array, ..., xn_array), which is fast for functions written
+    with NumPy operations. If this call fails or does not return one
+    value per row, func is called row by row. A single point is passed
+    as scalars, so functions that only take scalars, e.g. a wrapper of
+    an external solver, are called once.
+
+    Args:
+        func (function): g(X_1, ..., X_n)
+        points (array): 2d array, each row is a point and each column
+            is a variable
+
+    Returns:
+        g (array): 1d array with func evaluated at each row
+    """
+    points = np.atleast_2d(points)
+    if points.shape[0] == 1:
+        return np.array([func(*points[0])], dtype=float).reshape(1)
+    try:
+        g = np.asarray(func(*points.T), dtype=float)
+    except Exception:
+        g = None
+    if g is None or g.size != points.shape[0]:
+        g = np.array([func(*p) for p in points], dtype=float)
+    return g.reshape(points.shape[0])
+
+
+class CountedLimitState(object):
+    """Limit state that counts the points it is evaluated at
+
+    Called as the limit state, g(X_1, ..., X_n), with scalars or arrays.
+    A call with arrays counts one evaluation for each point.
+
+    Args:
+        limit_state (function): g(X_1, ..., X_n)
+
+    Attributes:
+        count (int): number of points evaluated
+    """
+    def __init__(self, limit_state):
+        self.limit_state = limit_state
+        self.count = 0
+
+    def __call__(self, *x):
+        self.count += int(np.prod(
+            np.broadcast_shapes(*(np.shape(xi) for xi in x))))
+        return self.limit_state(*x)
@@ -3,7 +3,7 @@ import numpy as np
 from .derivative import derivative
 
 
-def form_hl(limit_state, mean, std, var_func, tol=1e-3):
+def form_hl(limit_state, mean, std, var_func, tol=1e-3, gradient=derivative):
     """Performs the FORM-HL algorithm
 
     The goal is to find the reliability index for a nonlinear
@@ -13,6 +13,7 @@ def form_hl(limit_state, mean, std, var_func, tol=1e-3):
         limit_state (function): g(X_1, ..., X_n)
         mean (array): mean of random variables (RV)
         std (array): standard deviation of RV
+        gradient (function): gradient provider, see derivative module
 
     Returns:
         x (array): converged design point
@@ -30,7 +31,7 @@ def form_hl(limit_state, mean, std, var_func, tol=1e-3):
         z = (x - mean)/std
 
         # compute gradient of g with respect to z
-        grad_g_x = derivative(limit_state, x)
+        grad_g_x = gradient(limit_state, x)
         J_z_x = std
         grad_g_z = - grad_g_x * J_z_x
 
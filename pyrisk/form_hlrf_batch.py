@@ -0,0 +1,72 @@
+"""This module performs the FORM - HL-RF algorithm for many problems at once"""
+import numpy as np
+
+
+def form_hlrf_batch(limit_state, mean, std, tol=1e-3, max_iterations=100,
+                    eps=1e-6):
+    """Performs the FORM-HLRF algorithm for m problems in lockstep
+
+    The m problems share the limit state function but have different
+    means and standard deviations of the normal random variables. In the
+    standard space u = (x - mean)/std each iteration is,
+
+       u = (grad_g_u @ u - g(u)) / ||grad_g_u||**2 * grad_g_u
+       beta = (g(u) - grad_g_u @ u) / ||grad_g_u||
+
+    The limit state is called with arrays, g(x1_array, ..., xn_array),
+    for all problems still iterating and for all the 2n points of the
+    central differences at once. Converged problems are dropped from
+    the following iterations.
+
+    Args:
+        limit_state (function): g(X_1, ..., X_n) vectorized with NumPy
+        mean (array): (m, n) means of the random variables (RV)
+        std (array): (m, n) standard deviations of RV
+        tol (float): tolerance on the design point and beta
+        max_iterations (int): maximum number of iterations
+        eps (float): finite difference step in the standard space
+
+    Returns:
+        x (array): (m, n) design points
+        beta (array): (m,) reliability indexes
+        iterations (array): (m,) number of iterations of each problem
+    """
+    mean = np.atleast_2d(np.asarray(mean, dtype=float))
+    std = np.atleast_2d(np.asarray(std, dtype=float))
+    m, n = mean.shape
+
+    u = np.zeros((m, n))
+    beta = np.zeros(m)
+    iterations = np.zeros(m, dtype=int)
+    active = np.ones(m, dtype=bool)
+
+    # the point and its 2n perturbations along each u direction
+    steps = np.vstack([np.zeros(n), eps * np.identity(n),
+                       -eps * np.identity(n)])
+
+    for iteration in range(1, max_iterations + 1):
+        k = np.flatnonzero(active)
+        points = u[k] + steps[:, None, :]            # (2n + 1, len(k), n)
+        x = mean[k] + std[k] * points
+        g = np.asarray(limit_state(*x.reshape(-1, n).T), dtype=float)
+        g = g.reshape(2 * n + 1, len(k))
+
+        g_u = g[0]
+        grad_g_u = ((g[1:n + 1] - g[n + 1:]) / (2 * eps)).T
+        norm = np.linalg.norm(grad_g_u, axis=1)
+
+        beta_updt = (g_u - np.sum(grad_g_u * u[k], axis=1)) / norm
+        u_updt = - beta_updt[:, None] * grad_g_u / norm[:, None]
+
+        condition1 = (np.linalg.norm(u_updt - u[k], axis=1)
+                      < tol * np.maximum(np.linalg.norm(u_updt, axis=1), 1))
+        condition2 = np.abs(beta_updt - beta[k]) < tol
+
+        u[k] = u_updt
+        beta[k] = beta_updt
+        iterations[k] = iteration
+        active[k[condition1 & condition2]] = False
+        if not active.any():
+            break
+
+    return mean + std * u, beta, iterations
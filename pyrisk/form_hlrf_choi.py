@@ -1,12 +1,11 @@
 """This module performs the FORM - Hasofer and Lind algorithm from Choi book"""
 import numpy as np
-from scipy import stats
 from .derivative import derivative
 from .stochastic_model import StochasticModel
 from .std_linear import std_linear
 
 
-def form_hlrf_choi(limit_state, X, tol=1e-3):
+def form_hlrf_choi(limit_state, X, tol=1e-3, gradient=derivative):
     """Performs the FORM-HL algorithm
 
     The goal is to find the reliability index for a nonlinear
@@ -31,6 +30,7 @@ def form_hlrf_choi(limit_state, X, tol=1e-3):
     Args:
         limit_state (function): g(X_1, ...,X_n)
         X (object): random variables attributes of the stochastic model
+        gradient (function): gradient provider, see derivative module
 
     Returns:
         x (array): converged design point
@@ -41,7 +41,7 @@ def form_hlrf_choi(limit_state, X, tol=1e-3):
 
     # initial beta
     mu_g = limit_state(*X.mean)
-    grad_g_x = derivative(limit_state, X.mean)
+    grad_g_x = gradient(limit_state, X.mean, g0=mu_g)
     sig_g = std_linear(grad_g_x, X.std)
     beta = mu_g/sig_g
     alpha = - grad_g_x * X.std / sig_g
@@ -51,31 +51,25 @@ def form_hlrf_choi(limit_state, X, tol=1e-3):
 
     while not convergence:
 
-        for i, dist in enumerate(X.dist_name):
-            if dist is not 'norm':
-                # equivalent values
-                X.std[i] = (1/(X.dist_func[i].pdf(x[i]))
-                            * stats.norm.pdf(
-                                stats.norm.ppf(
-                                    X.dist_func[i].cdf(x[i]))))
-                X.mean[i] = x[i] - X.std[i] * (stats.norm.ppf(
-                    X.dist_func[i].cdf(x[i])))
+        # equivalent normal mean and std at x
+        mean, std = X.equivalent_normal(x)
 
         # transform to standard space
-        z = (x - X.mean)/X.std
+        z = (x - mean)/std
 
         # compute gradient of g with respect to z
-        grad_g_x = derivative(limit_state, x)
-        grad_g_z = grad_g_x * X.std
+        g_x = limit_state(*x)
+        grad_g_x = gradient(limit_state, x, g0=g_x)
+        grad_g_z = grad_g_x * std
 
         beta_previous = beta
-        beta = (limit_state(*x) - grad_g_z @ z) / np.linalg.norm(grad_g_z)
+        beta = (g_x - grad_g_z @ z) / np.linalg.norm(grad_g_z)
         alpha = - grad_g_z / np.linalg.norm(grad_g_z)
 
         # update design points in standard space
         z = alpha * beta
         # transform to physical space
-        x_updt = X.mean + z * X.std
+        x_updt = mean + z * std
 
         condition1 = np.linalg.norm(x_updt - x)/np.linalg.norm(x_updt) < tol
         condition2 = abs(np.round(beta, 3) - np.round(beta_previous, 3)) < tol
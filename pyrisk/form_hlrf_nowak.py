@@ -1,11 +1,11 @@
 """This module performs the FORM - Hasofer and Lind algorithm from Nowak book"""
 import numpy as np
-from scipy import stats
 from .derivative import derivative
 from .stochastic_model import StochasticModel
 
 
-def form_hlrf_nowak(limit_state, X, var_func, tol=1e-3):
+def form_hlrf_nowak(limit_state, X, var_func, tol=1e-3,
+                    gradient=derivative):
     """Performs the FORM-HL algorithm
 
     The goal is to find the reliability index for a nonlinear
@@ -18,6 +18,7 @@ def form_hlrf_nowak(limit_state, X, var_func, tol=1e-3):
         limit_state (function): g(X_1, ...,X_n)
         X (object): random variable attributes of the stochastic model
         var_func: inverse function to ensure g(x)=0
+        gradient (function): gradient provider, see derivative module
 
     Returns:
         x (array): converged design point
@@ -33,19 +34,15 @@ def form_hlrf_nowak(limit_state, X, var_func, tol=1e-3):
 
     while not convergence:
 
-        for i, dist in enumerate(X.dist_name):
-            if dist is not 'norm':
-                # equivalent values
-                X.std[i] = (1/(X.dist_func[i].pdf(x[i]))
-                            * stats.norm.pdf(stats.norm.ppf(X.dist_func[i].cdf(x[i]))))
-                X.mean[i] = x[i] - X.std[i] * (stats.norm.ppf(X.dist_func[i].cdf(x[i])))
+        # equivalent normal mean and std at x
+        mean, std = X.equivalent_normal(x)
 
         # transform to standard space
-        z = (x - X.mean)/X.std
+        z = (x - mean)/std
 
         # compute gradient of g with respect to z
-        grad_g_x = derivative(limit_state, x)
-        J_z_x = X.std
+        grad_g_x = gradient(limit_state, x)
+        J_z_x = std
         grad_g_z = - grad_g_x * J_z_x
 
         beta = grad_g_z @ z / np.linalg.norm(grad_g_z)
@@ -54,7 +51,7 @@ def form_hlrf_nowak(limit_state, X, var_func, tol=1e-3):
         # update design points in standard space
         z = alpha * beta
         # transform to physical space
-        x_updt = X.mean + z * X.std
+        x_updt = mean + z * std
         # # update last variable to guarantee g(Xi)=0
         x_updt[-1] = var_func(*x_updt)
 
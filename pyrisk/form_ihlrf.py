@@ -0,0 +1,137 @@
+"""This module performs the FORM - improved HL-RF algorithm"""
+import numpy as np
+from scipy import stats
+from .derivative import derivative
+from .evaluate import CountedLimitState
+
+
+class FormResult(object):
+    """Result of the FORM analysis
+
+    Attributes:
+        x (array): design point in the physical space
+        u (array): design point in the standard normal space
+        beta (float): reliability index
+        alpha (array): unit vector -grad_g_u/||grad_g_u|| at u
+        g (float): limit state at the design point
+        grad_u (array): gradient of g with respect to u at the design point
+        iterations (int): number of iterations
+        history (list): (beta, g, step) of each iteration
+        num_g (int): number of limit state evaluations, including the
+            ones of the gradient
+        num_grad (int): number of gradient evaluations
+        converged (bool): False if max_iterations was reached
+    """
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+    @property
+    def pf(self):
+        """First order probability of failure Phi(-beta)"""
+        return stats.norm.cdf(-self.beta)
+
+
+def form_ihlrf(limit_state, X, u0=None, x0=None, tol_u=1e-4, tol_beta=1e-4,
+               max_iterations=100, gradient=derivative,
+               armijo=.5, reduction=.5, max_backtracks=10):
+    """Performs the improved HL-RF algorithm (Zhang and Der Kiureghian)
+
+    The HL-RF direction in the standard normal space u,
+
+       d = beta_lin * alpha - u
+       beta_lin = (g(u) - grad_g_u @ u) / ||grad_g_u||
+
+    is followed with a step chosen by Armijo backtracking on the merit
+    function,
+
+       m(u) = ||u||**2 / 2 + c |g(u)|, with c > ||u|| / ||grad_g_u||
+
+    so the iterations do not oscillate on strongly nonlinear limit
+    states. The correlation and non-normal marginals are handled with the
+    Nataf transformation of X, and grad_g_u = J.T @ grad_g_x with the
+    Jacobian J = dx/du.
+
+    The iterations stop when the design point moves less than tol_u,
+    its distance to the linearized surface, |g| / ||grad_g_u||, is
+    less than tol_u and beta changes less than tol_beta, or after
+    max_iterations.
+
+    Args:
+        limit_state (function): g(X_1, ..., X_n)
+        X (object): random variables attributes of the stochastic model
+        u0 (array): starting point in the standard normal space, e.g. the
+            design point of a previous analysis, origin if None
+        x0 (array): starting point in the physical space, used if u0 is
+            None
+        tol_u (float): tolerance on the design point
+        tol_beta (float): tolerance on beta
+        max_iterations (int): maximum number of iterations
+        gradient (function): gradient provider, see derivative module
+        armijo (float): sufficient decrease parameter of the line search
+        reduction (float): step reduction of the line search
+        max_backtracks (int): maximum number of step reductions
+
+    Returns:
+        result (object): FormResult
+    """
+    g_counted = CountedLimitState(limit_state)
+    num_grad = 0
+    _, L = X.nataf()
+
+    if u0 is not None:
+        u = np.array(u0, dtype=float)
+    elif x0 is not None:
+        u = X.to_standard(np.asarray(x0, dtype=float))
+    else:
+        u = np.zeros(len(X.dist_func))
+
+    def grad_u_at(x, g):
+        _, std = X.equivalent_normal(x)
+        return L.T @ (std * gradient(g_counted, x, g0=g))
+
+    x = X.to_physical(u)
+    g = g_counted(*x)
+    grad_u = grad_u_at(x, g)
+    num_grad += 1
+    beta = - grad_u @ u / np.linalg.norm(grad_u)
+
+    history = []
+    converged = False
+    for iteration in range(1, max_iterations + 1):
+        norm = np.linalg.norm(grad_u)
+        alpha = - grad_u / norm
+        beta_lin = (g - grad_u @ u) / norm
+        d = beta_lin * alpha - u
+
+        c = 2 * max(np.linalg.norm(u), 1) / norm
+        merit = u @ u / 2 + c * abs(g)
+        slope = (u + c * np.sign(g) * grad_u) @ d
+
+        step = 1.
+        for backtrack in range(max_backtracks + 1):
+            u_updt = u + step * d
+            x_updt = X.to_physical(u_updt)
+            g_updt = g_counted(*x_updt)
+            merit_updt = u_updt @ u_updt / 2 + c * abs(g_updt)
+            if merit_updt <= merit + armijo * step * slope or slope >= 0:
+                break
+            step *= reduction
+
+        grad_u_updt = grad_u_at(x_updt, g_updt)
+        num_grad += 1
+        beta_updt = - grad_u_updt @ u_updt / np.linalg.norm(grad_u_updt)
+        history.append((beta_updt, g_updt, step))
+
+        converged = (np.linalg.norm(u_updt - u)
+                     <= tol_u * max(1, np.linalg.norm(u_updt))
+                     and abs(g_updt) / np.linalg.norm(grad_u_updt) <= tol_u
+                     and abs(beta_updt - beta) <= tol_beta)
+        u, x, g, grad_u, beta = u_updt, x_updt, g_updt, grad_u_updt, beta_updt
+        if converged:
+            break
+
+    return FormResult(x=x, u=u, beta=beta,
+                      alpha=- grad_u / np.linalg.norm(grad_u), g=g,
+                      grad_u=grad_u, iterations=iteration, history=history,
+                      num_g=g_counted.count, num_grad=num_grad,
+                      converged=converged)
@@ -1,21 +1,130 @@
-from .derivative import derivative
+from itertools import product
+from math import comb
+import numpy as np
+from .derivative import derivative, hessian
+from .evaluate import evaluate
 
 
-def mean_variance(func, mean_vector, cov_matrix):
+def mean_variance(func, mean_vector, cov_matrix, gradient=derivative,
+                  method='fosm', order=3, level=2, kappa=None):
     """Computes mean and variance of a function that depends on other variables
 
+    The variables are assumed jointly normal. The methods are:
+
+        'fosm': first order, mu = func(mean) and var = d @ cov @ d
+        'sosm': second order, with the Hessian H from one batched call,
+            mu = func(mean) + tr(H cov)/2
+            var = d @ cov @ d + tr(H cov H cov)/2
+        'gauss_hermite': tensor Gauss-Hermite rule with order points in
+            each direction, order**n evaluations
+        'smolyak': Smolyak sparse grid of Gauss-Hermite rules, for larger
+            n, exact for polynomials of degree 2 * level - 1
+        'unscented': 2n + 1 sigma points
+
+    The quadrature methods evaluate func on all nodes in one call,
+    func(x1_array, ..., xn_array), see evaluate.
+
     Args:
         func: function of variables
         mean_vector: array with means of variable
         cov_matrix: covariance matrix
+        gradient (function): gradient provider for 'fosm'
+        method (str): propagation method
+        order (int): points per direction of 'gauss_hermite'
+        level (int): level of 'smolyak'
+        kappa (float): spread of 'unscented', 3 - n if None
     """
-    mu = func(*mean_vector)
+    if method == 'fosm':
+        mu = func(*mean_vector)
+
+        d = gradient(func, mean_vector, g0=mu)
+
+        var = d @ cov_matrix @ d
 
-    d = derivative(func, points=mean_vector)
+        return mu, var
 
-    var = 0
-    for i in range(len(mean_vector)):
-        for j in range(len(mean_vector)):
-            var += d[i]*d[j]*(cov_matrix[i][j])
+    mean_vector = np.asarray(mean_vector, dtype=float)
+    cov_matrix = np.asarray(cov_matrix, dtype=float)
+    n = len(mean_vector)
 
+    if method == 'sosm':
+        # variables with zero variance still need a finite step
+        step = np.maximum(1e-3 * np.sqrt(np.diag(cov_matrix)),
+                          1e-6 * np.maximum(1, abs(mean_vector)))
+        H, d, g0 = hessian(func, mean_vector, step)
+        HC = H @ cov_matrix
+        mu = g0 + np.trace(HC) / 2
+        var = d @ cov_matrix @ d + np.trace(HC @ HC) / 2
+        return mu, var
+
+    if method == 'gauss_hermite':
+        z, w = _tensor_rule([order] * n)
+    elif method == 'smolyak':
+        z, w = _smolyak_rule(n, level)
+    elif method == 'unscented':
+        kappa = 3 - n if kappa is None else kappa
+        z = np.vstack([np.zeros(n), np.sqrt(n + kappa) * np.identity(n),
+                       -np.sqrt(n + kappa) * np.identity(n)])
+        w = np.full(2 * n + 1, 1 / (2 * (n + kappa)))
+        w[0] = kappa / (n + kappa)
+    else:
+        raise ValueError('method {} not implemented'.format(method))
+
+    # standard normal nodes to correlated normal variables, cov = L @ L.T
+    # also when variables have zero variance
+    eigval, eigvec = np.linalg.eigh(cov_matrix)
+    L = eigvec * np.sqrt(np.maximum(eigval, 0))
+    g = evaluate(func, mean_vector + z @ L.T)
+    mu = w @ g
+    var = w @ (g - mu)**2
     return mu, var
+
+
+def _hermite_rule(m):
+    """Gauss-Hermite rule with m points for the standard normal"""
+    z, w = np.polynomial.hermite_e.hermegauss(m)
+    return z, w / np.sqrt(2 * np.pi)
+
+
+def _tensor_rule(points):
+    """Tensor product of Gauss-Hermite rules"""
+    rules = [_hermite_rule(m) for m in points]
+    z = np.array(list(product(*[r[0] for r in rules])))
+    w = np.prod(list(product(*[r[1] for r in rules])), axis=1)
+    return z, w
+
+
+def _smolyak_rule(n, level):
+    """Smolyak sparse grid with the combination technique
+
+        A(q, n) = sum_{q-n+1 <= |l| <= q} (-1)**(q-|l|) C(n-1, q-|l|)
+                  Q_l1 x ... x Q_ln
+
+    with q = n + level - 1 and Q_l the Gauss-Hermite rule with 2l - 1
+    points. Repeated nodes are merged, so func is evaluated once at each.
+    """
+    q = n + level - 1
+    nodes = {}
+    for l in _multi_indices(n, q):
+        total = sum(l)
+        if total < q - n + 1:
+            continue
+        c = (-1)**(q - total) * comb(n - 1, q - total)
+        z, w = _tensor_rule([2 * li - 1 for li in l])
+        for zi, wi in zip(np.round(z, 12), w):
+            key = tuple(zi)
+            nodes[key] = nodes.get(key, 0) + c * wi
+    z = np.array(list(nodes.keys()))
+    w = np.array(list(nodes.values()))
+    return z, w
+
+
+def _multi_indices(n, q):
+    """Multi-indices l >= 1 of length n with sum(l) <= q"""
+    if n == 1:
+        for li in range(1, q + 1):
+            yield (li,)
+        return
+    for li in range(1, q - n + 2):
+        for rest in _multi_indices(n - 1, q - li):
+            yield (li,) + rest
@@ -0,0 +1,57 @@
+"""Importance sampling around the design point"""
+import numpy as np
+from .evaluate import evaluate
+from .form_hlrf_correlation import form_hlrf_correlation
+
+
+def importance_sampling(limit_state, X, num_simulations, x=None,
+                        chunk_size=100000, seed=None):
+    """Estimate the probability of failure by importance sampling
+
+    The samples v are drawn in the standard normal space from a normal
+    density with unit variance centered on the design point u*. Each
+    failed sample is weighted by the ratio between the standard normal
+    density and the sampling density,
+
+        w = phi(v) / phi(v - u*) = exp(-v @ u* + u* @ u* / 2)
+
+    so pf = mean(I[g < 0] w). Since about half of the samples fall in the
+    failure domain, a small coefficient of variation is reached with
+    a few thousand limit state evaluations even for very small pf.
+
+    Args:
+        limit_state (function): g(X_1, ..., X_n)
+        X (object): random variables attributes of the stochastic model
+        num_simulations: number of simulations
+        x (array): design point in the physical space, e.g. from
+            form_hlrf_choi or form_hlrf_correlation. If None, it is
+            computed with form_hlrf_correlation
+        chunk_size: number of samples generated at once
+        seed: seed for the random number generator
+
+    Returns:
+        pf (float): probability of failure
+        cov (float): coefficient of variation of pf
+        ess (float): effective sample size of the weighted failures
+    """
+    if x is None:
+        x, _, _ = form_hlrf_correlation(limit_state, X)
+    u_star = X.to_standard(x)
+
+    rng = np.random.default_rng(seed)
+    sum_w, sum_w2 = 0, 0
+    done = 0
+    while done < num_simulations:
+        n = min(chunk_size, num_simulations - done)
+        v = u_star + rng.standard_normal((n, len(u_star)))
+        g = evaluate(limit_state, X.to_physical(v))
+        w = np.exp(- v @ u_star + u_star @ u_star / 2) * (g < 0)
+        sum_w += w.sum()
+        sum_w2 += (w**2).sum()
+        done += n
+
+    pf = sum_w / num_simulations
+    var = (sum_w2 / num_simulations - pf**2) / num_simulations
+    cov = np.sqrt(var) / pf if pf > 0 else np.inf
+    ess = sum_w**2 / sum_w2 if sum_w2 > 0 else 0
+    return pf, cov, ess
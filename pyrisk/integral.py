@@ -1,4 +1,8 @@
 """Computes the integral of a function"""
+import numpy as np
+from .evaluate import evaluate
+
+
 def trapezoidal(func, interval=[0, 1], num_division=10):
     """computes integral using trapezoidal rule
 
@@ -61,3 +65,206 @@ def trapezoidal(func, interval=[0, 1], num_division=10):
         xi += dx
 
     return integral
+
+
+def integrate(func, interval=[0, 1], rule='gauss', tol=1e-10, rtol=1e-10,
+              order=10, max_intervals=2000):
+    """Computes the integral of func with adaptive vectorized quadrature
+
+    func is evaluated on all the nodes of a refinement step in one call,
+    func(x_array), and called for each node only if that fails.
+
+    Infinite bounds, np.inf or the strings 'inf' and '-inf', are mapped
+    to a finite interval with,
+
+        x = a + t/(1 - t)       for [a, inf)
+        x = b - t/(1 - t)       for (-inf, b]
+        x = t/(1 - t**2)        for (-inf, inf)
+
+    The rules are:
+
+        'gauss': Gauss-Legendre with order nodes in each subinterval
+        'simpson': composite Simpson with Richardson extrapolation
+        'tanh_sinh': double exponential on the whole interval, which
+            handles endpoint singularities
+
+    For 'gauss' and 'simpson' the subintervals whose error estimate,
+    the difference between the rule on the subinterval and on its two
+    halves, is too large are bisected until the total error is below
+    max(tol, rtol * |integral|). For 'tanh_sinh' the step is halved.
+    The nodes of 'gauss' and 'tanh_sinh' are inside the subintervals,
+    so integrable singularities at the bounds are never evaluated.
+
+    Args:
+        func (function): f(x)
+        interval (list): [a, b]
+        rule (str): 'gauss', 'simpson' or 'tanh_sinh'
+        tol (float): absolute tolerance
+        rtol (float): relative tolerance
+        order (int): number of Gauss-Legendre nodes
+        max_intervals (int): maximum number of subintervals
+
+    Returns:
+        integral (float): approximated integral result
+        error (float): estimate of the absolute error
+    """
+    f, a, b = _finite_interval(func, interval)
+    if a == b:
+        return 0., 0.
+    if rule == 'tanh_sinh':
+        return _tanh_sinh(f, a, b, tol, rtol)
+    if rule == 'gauss':
+        nodes, weights = np.polynomial.legendre.leggauss(order)
+        estimate = _gauss_estimate(nodes, weights)
+    elif rule == 'simpson':
+        estimate = _simpson_estimate
+    else:
+        raise ValueError('rule {} not implemented'.format(rule))
+
+    done_value, done_error, num_done = 0., 0., 0
+    left, right = np.array([a]), np.array([b])
+    while True:
+        value, error = estimate(f, left, right)
+        total = done_value + value.sum()
+        target = max(tol, rtol * abs(total))
+        if (done_error + error.sum() <= target
+                or num_done + 2 * len(left) > max_intervals):
+            return total, done_error + error.sum()
+
+        # keep the subintervals already converged, bisect the others
+        share = target * (right - left) / (b - a)
+        accept = error <= share
+        done_value += value[accept].sum()
+        done_error += error[accept].sum()
+        num_done += np.count_nonzero(accept)
+        left, right = left[~accept], right[~accept]
+        middle = (left + right) / 2
+        left, right = (np.concatenate([left, middle]),
+                       np.concatenate([middle, right]))
+
+
+def _finite_interval(func, interval):
+    """Integrand and bounds after mapping infinite bounds to finite ones"""
+    a, b = float(interval[0]), float(interval[1])
+
+    def f(x):
+        return evaluate(func, x[:, None])
+
+    if np.isfinite(a) and np.isfinite(b):
+        return f, a, b
+
+    def mapped(t, x, dx):
+        # the integrand goes to zero at infinity
+        value = np.zeros_like(t)
+        finite = np.isfinite(x) & np.isfinite(dx)
+        value[finite] = f(x[finite]) * dx[finite]
+        return value
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if np.isinf(a) and np.isinf(b):
+            return (lambda t: mapped(t, t / (1 - t**2),
+                                     (1 + t**2) / (1 - t**2)**2)), -1., 1.
+        if np.isinf(b):
+            return (lambda t: mapped(t, a + t / (1 - t),
+                                     1 / (1 - t)**2)), 0., 1.
+        return (lambda t: mapped(t, b - t / (1 - t),
+                                 1 / (1 - t)**2)), 0., 1.
+
+
+def _gauss_estimate(nodes, weights):
+    """Gauss-Legendre on each subinterval and on its two halves"""
+    # nodes of the whole subinterval and of the halves in [-1, 1]
+    all_nodes = np.concatenate([nodes, (nodes - 1) / 2, (nodes + 1) / 2])
+
+    def estimate(f, left, right):
+        half = (right - left)[:, None] / 2
+        x = (left + right)[:, None] / 2 + half * all_nodes
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            fx = f(x.ravel()).reshape(x.shape) * half
+        n = len(nodes)
+        coarse = fx[:, :n] @ weights
+        fine = (fx[:, n:2 * n] @ weights + fx[:, 2 * n:] @ weights) / 2
+        return fine, np.abs(fine - coarse)
+    return estimate
+
+
+def _simpson_estimate(f, left, right):
+    """Simpson on each subinterval and on its two halves"""
+    h = (right - left)[:, None]
+    x = left[:, None] + h * np.linspace(0, 1, 5)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        fx = f(x.ravel()).reshape(x.shape)
+    coarse = h[:, 0] / 6 * (fx[:, 0] + 4 * fx[:, 2] + fx[:, 4])
+    fine = h[:, 0] / 12 * (fx[:, 0] + 4 * fx[:, 1] + 2 * fx[:, 2]
+                           + 4 * fx[:, 3] + fx[:, 4])
+    return fine + (fine - coarse) / 15, np.abs(fine - coarse) / 15
+
+
+def _tanh_sinh(f, a, b, tol, rtol, max_level=12):
+    """Double exponential rule, the step is halved until convergence"""
+    center, half = (a + b) / 2, (b - a) / 2
+
+    def level_sum(k, h):
+        s = np.pi / 2 * np.sinh(k * h)
+        # distance of the node to the closest bound, without cancellation
+        distance = half / (np.exp(s) * np.cosh(s))
+        distance = np.where(s > 0, distance,
+                            half / (np.exp(-s) * np.cosh(s)))
+        x = np.where(s > 0, b - distance, a + distance)
+        w = half * h * np.pi / 2 * np.cosh(k * h) / np.cosh(s)**2
+        inside = (x > a) & (x < b) & (w > 0)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            return np.sum(f(x[inside]) * w[inside])
+
+    # nodes up to |t| = 4, beyond that the weights underflow
+    h = 1.
+    k = np.arange(-4, 5)
+    value = level_sum(k, h)
+    for level in range(max_level):
+        h /= 2
+        # only the odd nodes are new
+        k = np.arange(-int(4 / h) + 1, int(4 / h), 2)
+        new = value / 2 + level_sum(k, h)
+        error = abs(new - value)
+        value = new
+        if error <= max(tol, rtol * abs(value)):
+            break
+    return value, error
+
+
+def quadrature_grid(interval=[0, 1], num_division=100, order=10):
+    """Nodes and weights of a composite Gauss-Legendre rule
+
+    The integral of any function h is then sum(w * h(x)), so the same
+    nodes can be reused for several integrands. Infinite bounds are
+    mapped as in integrate and the Jacobian is included in the weights.
+
+    Args:
+        interval (list): [a, b]
+        num_division (int): number of subintervals
+        order (int): number of nodes in each subinterval
+
+    Returns:
+        x (array): nodes
+        w (array): weights
+    """
+    a, b = float(interval[0]), float(interval[1])
+    t_a, t_b = a, b
+    if np.isinf(a) and np.isinf(b):
+        t_a, t_b = -1., 1.
+    elif np.isinf(a) or np.isinf(b):
+        t_a, t_b = 0., 1.
+
+    nodes, weights = np.polynomial.legendre.leggauss(order)
+    edges = np.linspace(t_a, t_b, num_division + 1)
+    half = np.diff(edges)[:, None] / 2
+    t = ((edges[:-1] + edges[1:])[:, None] / 2 + half * nodes).ravel()
+    w = (half * weights).ravel()
+
+    if np.isinf(a) and np.isinf(b):
+        return t / (1 - t**2), w * (1 + t**2) / (1 - t**2)**2
+    if np.isinf(b):
+        return a + t / (1 - t), w / (1 - t)**2
+    if np.isinf(a):
+        return b - t / (1 - t), w / (1 - t)**2
+    return t, w
@@ -0,0 +1,80 @@
+"""Computes the moments of a pdf in one pass over a quadrature grid"""
+import numpy as np
+from .evaluate import evaluate
+from .integral import quadrature_grid
+
+
+def raw_moments(func, interval=[0, 1], order=4, g=None, num_division=100):
+    """Computes E[g**k] for k = 0, ..., order
+
+    The pdf and g are evaluated once on a composite Gauss-Legendre grid
+    and the values are reused for all moments.
+
+    Args:
+        func (function): pdf f(x)
+        interval (list): [a, b], bounds may be infinite
+        order (int): highest moment
+        g (function): g(x), x if None
+        num_division (int): number of subintervals of the grid
+
+    Returns:
+        moments (array): E[g**k], the first entry is the total probability
+    """
+    gx, wf = _grid(func, interval, g, num_division)
+    return np.array([wf @ gx**k for k in range(order + 1)])
+
+
+def central_moments(func, interval=[0, 1], order=4, g=None,
+                    num_division=100):
+    """Computes E[(g - E[g])**k] for k = 0, ..., order
+
+    Args:
+        func (function): pdf f(x)
+        interval (list): [a, b], bounds may be infinite
+        order (int): highest moment
+        g (function): g(x), x if None
+        num_division (int): number of subintervals of the grid
+
+    Returns:
+        moments (array): E[(g - E[g])**k]
+    """
+    gx, wf = _grid(func, interval, g, num_division)
+    return _central(gx, wf, order)
+
+
+def moments(func, interval=[0, 1], g=None, num_division=100):
+    """Computes mean, variance, skewness and kurtosis of g(X)
+
+    Args:
+        func (function): pdf f(x)
+        interval (list): [a, b], bounds may be infinite
+        g (function): g(x), x if None
+        num_division (int): number of subintervals of the grid
+
+    Returns:
+        E (float): expected value
+        var (float): variance
+        skewness (float): third standardized moment
+        kurtosis (float): fourth standardized moment, 3 for normal
+    """
+    gx, wf = _grid(func, interval, g, num_division)
+    E = wf @ gx
+    _, _, var, m3, m4 = _central(gx, wf, 4)
+    return E, var, m3 / var**1.5, m4 / var**2
+
+
+def _grid(func, interval, g, num_division):
+    """g and pdf times weights at the nodes, zero weight nodes dropped"""
+    x, w = quadrature_grid(interval, num_division)
+    keep = np.isfinite(x) & np.isfinite(w)
+    x, w = x[keep], w[keep]
+    wf = w * evaluate(func, x[:, None])
+    # nodes far in the tails do not contribute and may overflow g
+    x, wf = x[wf != 0], wf[wf != 0]
+    gx = x if g is None else evaluate(g, x[:, None])
+    return gx, wf
+
+
+def _central(gx, wf, order):
+    d = gx - wf @ gx
+    return np.array([wf @ d**k for k in range(order + 1)])
@@ -1,33 +1,80 @@
 """Generates random numbers from Monte Carlo simulation"""
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from scipy import stats
+from scipy.stats import qmc
+from .distributions import Gumbel
+from .evaluate import evaluate
+from .stochastic_model import StochasticModel
 
 
-def normal(num_simulations, mu, sig):
+def _engine(method, d, rng):
+    """Scrambled low discrepancy sequence or latin hypercube of scipy"""
+    if method == 'sobol':
+        return qmc.Sobol(d, scramble=True, seed=rng)
+    elif method == 'halton':
+        return qmc.Halton(d, scramble=True, seed=rng)
+    elif method == 'lhs':
+        return qmc.LatinHypercube(d, seed=rng)
+    raise ValueError('method {} not implemented'.format(method))
+
+
+def _uniform(num_simulations, rng, method='random', d=None, skip=0):
+    """Uniform [0, 1] numbers from rng or from the global numpy state
+
+    With method 'sobol', 'halton' or 'lhs' the numbers are points of a
+    d dimensional quasi random engine seeded with rng, starting after
+    the first skip points. d None returns a 1d array.
+    """
+    if method == 'random':
+        shape = num_simulations if d is None else (num_simulations, d)
+        if rng is None:
+            return np.random.random_sample(shape)
+        return np.random.default_rng(rng).random(shape)
+    engine = _engine(method, 1 if d is None else d, rng)
+    if skip:
+        engine.fast_forward(int(skip))
+    u = engine.random(num_simulations)
+    return u[:, 0] if d is None else u
+
+
+def _standard_normal(num_simulations, rng, method='random', d=None,
+                     skip=0):
+    """Standard normal numbers from rng or from the global numpy state"""
+    if method == 'random':
+        shape = num_simulations if d is None else (num_simulations, d)
+        if rng is None:
+            return np.random.standard_normal(shape)
+        return np.random.default_rng(rng).standard_normal(shape)
+    return stats.norm.ppf(_uniform(num_simulations, rng, method, d, skip))
+
+
+def normal(num_simulations, mu, sig, rng=None, method='random'):
     """Perform Monte Carlo simulation to generate rv following normal distribution
 
     Args:
         num_simulations: number of simulations
         mu: mean of RV following normal distribution
         sig: standard deviation of distribution
+        rng: numpy Generator or seed, None uses the global numpy state
+        method: 'random', or quasi random 'sobol', 'halton' or 'lhs'
 
     Returns:
         rv: rv -> N(mu, sig) as a numpy ndarray
 
     """
-    u = np.random.rand(num_simulations)  # uniform [0, 1]
-    z = stats.norm.ppf(u)              # standard normal [0, 1]
-    x = z * sig + mu                   # normal [mu, sig]
+    z = _standard_normal(num_simulations, rng, method)  # N[0, 1]
+    x = z * sig + mu                            # normal [mu, sig]
     return x
 
 
-def lognormal(num_simulations, mu, sig):
+def lognormal(num_simulations, mu, sig, rng=None, method='random'):
     """Generate lognormal random variable
 
     In order to generate a RV X -> LN(mu_X, sig_X) first we generate
-    ui uniform random number, then transform it to standard normal,
-    finally transform it to lognormal using the following relation
-    betweeen normal and lognormal distributions,
+    zi standard normal random number, then transform it to lognormal
+    using the following relation betweeen normal and lognormal
+    distributions,
 
         sig_lnX = sqrt(ln(sig_X**2/mu_X**2 + 1))
         mu_lnX = ln(mu_X) - 0.5 * sig_lnX**2
@@ -38,13 +85,14 @@ def lognormal(num_simulations, mu, sig):
         num_simulations: number of simulations
         mu: mean of the RV following lognormal distribution
         sig: standard deviation of RV distribution
+        rng: numpy Generator or seed, None uses the global numpy state
+        method: 'random', or quasi random 'sobol', 'halton' or 'lhs'
 
     Returns:
         rv: rv -> lN(mu, sig) as a numpy ndarray
 
     """
-    u = np.random.rand(num_simulations)  # uniform [0, 1]
-    z = stats.norm.ppf(u)              # standard normal [0, 1]
+    z = _standard_normal(num_simulations, rng, method)  # N[0, 1]
 
     sig_ln = np.sqrt(np.log(sig**2/mu**2 + 1))
     mu_ln = np.log(mu) - 1/2 * sig_ln**2
@@ -53,7 +101,7 @@ def lognormal(num_simulations, mu, sig):
     return x
 
 
-def gumbel_r(num_simulations, mu, sig):
+def gumbel_r(num_simulations, mu, sig, rng=None, method='random'):
     """Generates Gumbel right skewed random variable
 
     Gumbel right skewed, also knwon as extreme Type I,
@@ -77,65 +125,187 @@ def gumbel_r(num_simulations, mu, sig):
         num_simulations: number of simulations
         mu: mean of the RV following lognormal distribution
         sig: standard deviation of RV distribution
+        rng: numpy Generator or seed, None uses the global numpy state
+        method: 'random', or quasi random 'sobol', 'halton' or 'lhs'
 
     Returns:
         x: rv -> Gumbel Right (mu, sig) as a numpy ndarray
 
     """
-    u = np.random.rand(num_simulations)  # uniform [0, 1]
+    u = _uniform(num_simulations, rng, method)  # uniform [0, 1]
 
-    a = np.sqrt(np.pi**2/(6*sig**2))
-    loc = mu - 0.5772/a
-    scale = 1/a
-
-    x = stats.gumbel_r.ppf(u, loc=loc, scale=scale)
+    # closed form Fx^{-1}(u) = loc - scale ln(-ln(u))
+    x = Gumbel(mu, sig).ppf(u)
     return x
 
 
-def correlated(*args, cov=None, num_simulations=1000):
+def correlated(*args, cov=None, num_simulations=1000, rng=None,
+               method='random'):
     """generate X_N correlated random variables
 
+    The variables may follow any distribution of StochasticModel, the
+    correlation is imposed with the Nataf transformation. All samples are
+    transformed at once with the Cholesky factor of the correlation
+    matrix of the equivalent standard normal variables.
+
     Args:
         *args (list): [dist, mu, sig] of each random variable
         cov (array): 2d array with covariance elements
+        rng: numpy Generator or seed, None uses the global numpy state
+        method: 'random', or quasi random 'sobol', 'halton' or 'lhs'
 
     Returns:
         [X_N]: array with random variables each column is a variables
                each row is a sample
     """
-    dist, mu_x, sig_x = [], [], []
-    for d, m, s in args:
-        dist.append(d)
-        mu_x.append(m)
-        sig_x.append(s)
-
-    Cx = cov
-    _, T = np.linalg.eig(Cx)
-    Cy = T.T @ Cx @ T
-
-    mu_x = np.array(mu_x)
-    mu_y = T.T @ mu_x
-
-    sig_y = [np.sqrt(Cy[i, i]) for i in range(Cy.shape[0])]
-
-    y = np.zeros((num_simulations, len(dist)))
-    for i, d in enumerate(dist):
-        if d is 'norm':
-            y[:, i] = normal(num_simulations, mu_y[i], sig_y[i])
-        elif d is 'lognorm':
-            # avoid taking ln of negative value
-            if mu_y[i] < 0:
-                mu_y[i] = - mu_y[i]
-            y[:, i] = lognormal(num_simulations, mu_y[i], sig_y[i])
-        else:
-            print('Dist not implemented!')
-
-    x = []
-    for yi in y:
-        x.append(T @ yi)
-    x = np.array(x)
+    sig = np.sqrt(np.diag(cov))
+    X = StochasticModel(*args, rho=cov / np.outer(sig, sig))
 
-    return x
+    u = _standard_normal(num_simulations, rng, method, len(args))
+    return X.to_physical(u)
+
+
+def sample(X, num_simulations, rng=None, method='random', skip=0):
+    """Generate samples of the random variables of a stochastic model
+
+    Independent standard normal samples are mapped to the physical space
+    with the Nataf transformation, so the correlation in X.rho is
+    imposed.
+
+    With a quasi random method the standard normals are the inverse
+    normal cdf of the points of a scrambled Sobol or Halton sequence, or
+    of a latin hypercube, of dimension n.
+
+    Args:
+        X (object): random variables attributes of the stochastic model
+        num_simulations: number of simulations
+        rng: numpy Generator or seed
+        method: 'random', or quasi random 'sobol', 'halton' or 'lhs'
+        skip: number of points of the sequence to skip
+
+    Returns:
+        x (array): each column is a variable and each row is a sample
+    """
+    rng = np.random.default_rng(rng)
+    u = _standard_normal(num_simulations, rng, method, len(X.dist_func),
+                         skip)
+    return X.to_physical(u)
+
+
+def failure_probability(limit_state, X, num_simulations, chunk_size=100000,
+                        confidence=.95, seed=None, processes=None,
+                        method='random'):
+    """Estimate the probability of failure P[g(X) < 0] by Monte Carlo
+
+    Samples are generated and evaluated in chunks of chunk_size, only the
+    number of failures is kept between chunks. So the memory used is
+    bounded by chunk_size no matter how large num_simulations is.
+
+    The limit state is evaluated on the whole chunk at once,
+    g(x1_array, ..., xn_array), if it supports NumPy arrays, otherwise
+    it is called for each sample.
+
+    Each chunk draws from its own Generator spawned from seed, so the
+    chunks can be distributed over a process pool and the result for a
+    given seed does not depend on the number of processes. With
+    processes the limit state and X must be picklable, e.g. limit state
+    defined at module level.
+
+    With method 'sobol' or 'halton' the chunks are consecutive blocks of
+    one scrambled sequence, each chunk fast forwards to its first point,
+    use powers of 2 for chunk_size with 'sobol'. With 'lhs' each chunk is
+    a latin hypercube. The cov and interval are the binomial ones, which
+    are conservative for quasi random samples, see expectation for
+    error estimates from randomized replicates.
+
+    Args:
+        limit_state (function): g(X_1, ..., X_n)
+        X (object): random variables attributes of the stochastic model
+        num_simulations: number of simulations
+        chunk_size: number of samples generated at once
+        confidence: confidence level of the interval
+        seed: seed for the random number generator
+        processes: number of worker processes, None runs serially
+        method: 'random', or quasi random 'sobol', 'halton' or 'lhs'
+
+    Returns:
+        pf (float): probability of failure
+        cov (float): coefficient of variation of pf
+        ci (tuple): (lower, upper) confidence interval of pf
+    """
+    sizes = [chunk_size] * (num_simulations // chunk_size)
+    if num_simulations % chunk_size:
+        sizes.append(num_simulations % chunk_size)
+    if method in ('sobol', 'halton'):
+        # the same scrambling in every chunk, scipy spawns from the
+        # SeedSequence of a Generator so an int entropy is shared
+        seeds = [np.random.SeedSequence(seed).entropy] * len(sizes)
+        skips = np.cumsum([0] + sizes[:-1])
+    else:
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        skips = [0] * len(sizes)
+    tasks = ([limit_state] * len(sizes), [X] * len(sizes), sizes, seeds,
+             [method] * len(sizes), skips)
+
+    if processes is None or processes == 1:
+        num_failures = sum(map(_count_failures, *tasks))
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            num_failures = sum(pool.map(
+                _count_failures, *tasks,
+                chunksize=max(1, len(sizes) // (4 * processes))))
+    return _estimate(num_failures, num_simulations, confidence)
+
+
+def _count_failures(limit_state, X, num_simulations, seed,
+                    method='random', skip=0):
+    """Count the samples with g < 0 in one chunk"""
+    g = evaluate(limit_state, sample(X, num_simulations,
+                                     np.random.default_rng(seed),
+                                     method, skip))
+    return np.count_nonzero(g < 0)
+
+
+def expectation(func, X, num_simulations, num_replicates=10,
+                method='sobol', seed=None):
+    """Estimate E[func(X)] with randomized quasi Monte Carlo
+
+    The mean is computed with num_replicates independently scrambled
+    sequences of num_simulations points, the spread between the
+    replicate means gives the standard error, which the binomial or
+    sample variance formulas overestimate for quasi random points.
+    For a probability of failure use func = g(X) < 0.
+
+    Args:
+        func (function): f(X_1, ..., X_n)
+        X (object): random variables attributes of the stochastic model
+        num_simulations: number of points in each replicate
+        num_replicates: number of scrambled replicates
+        method: 'sobol', 'halton', 'lhs' or 'random'
+        seed: seed for the scrambling
+
+    Returns:
+        mean (float): estimate of E[func(X)]
+        error (float): standard error of the mean
+    """
+    seeds = np.random.SeedSequence(seed).spawn(num_replicates)
+    means = np.array([np.mean(evaluate(func, sample(X, num_simulations,
+                                                    s, method)))
+                      for s in seeds])
+    return means.mean(), means.std(ddof=1) / np.sqrt(num_replicates)
+
+
+def _estimate(num_failures, num_simulations, confidence):
+    """Compute pf, its coefficient of variation and Wilson interval"""
+    n = num_simulations
+    pf = num_failures / n
+    cov = np.sqrt((1 - pf) / (n * pf)) if pf > 0 else np.inf
+
+    z = stats.norm.ppf(.5 + confidence / 2)
+    center = (pf + z**2 / (2 * n)) / (1 + z**2 / n)
+    half = (z / (1 + z**2 / n)
+            * np.sqrt(pf * (1 - pf) / n + z**2 / (4 * n**2)))
+    return pf, cov, (max(center - half, 0), min(center + half, 1))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,89 @@
+"""Nataf transformation between physical and standard normal space"""
+import numpy as np
+from scipy import stats, optimize
+
+
+def nataf_correlation(X, num_points=32):
+    """Compute the correlation matrix of the equivalent normal variables
+
+    In the Nataf model each variable X_i is mapped to a standard normal
+    Z_i = Phi^{-1}(F_i(X_i)). The correlation rho_z between Z_i and Z_j
+    that gives the correlation rho_x between X_i and X_j is found from,
+
+        rho_x = E[(x_i - mu_i)(x_j - mu_j)] / (sig_i sig_j)
+
+    where the expectation over the bivariate normal (Z_i, Z_j) with
+    correlation rho_z is computed with Gauss-Hermite quadrature.
+
+    Args:
+        X (object): random variables attributes of the stochastic model
+        num_points: number of quadrature points in each direction
+
+    Returns:
+        rho_z (array): correlation matrix of the standard normal variables
+    """
+    n = len(X.dist_func)
+    rho_z = np.identity(n)
+
+    z, w = np.polynomial.hermite_e.hermegauss(num_points)
+    w = w / np.sqrt(2 * np.pi)
+    za, zb = np.meshgrid(z, z, indexing='ij')
+    weight = np.outer(w, w)
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            rho = X.rho[i, j]
+            if rho == 0:
+                continue
+            if X.dist_name[i] == 'norm' and X.dist_name[j] == 'norm':
+                rho_z[i, j] = rho_z[j, i] = rho
+                continue
+
+            di, dj = X.dist_func[i], X.dist_func[j]
+            xi = (_from_normal(di, za) - di.mean()) / di.std()
+
+            def residual(r):
+                zj = r * za + np.sqrt(1 - r**2) * zb
+                xj = (_from_normal(dj, zj) - dj.mean()) / dj.std()
+                return np.sum(weight * xi * xj) - rho
+
+            try:
+                r = optimize.brentq(residual, -.9999, .9999)
+            except ValueError:
+                raise ValueError(
+                    'correlation {} between variables {} and {} can not '
+                    'be represented by the Nataf model'.format(
+                        rho, i + 1, j + 1))
+            rho_z[i, j] = rho_z[j, i] = r
+
+    return rho_z
+
+
+def cholesky(rho):
+    """Lower triangular factor L of a correlation matrix, rho = L @ L.T
+
+    If rho is not positive definite, e.g. near-singular because of
+    perfectly correlated variables, the negative and zero eigenvalues are
+    clipped and the matrix is rescaled to unit diagonal before factoring.
+
+    Args:
+        rho (array): correlation matrix
+
+    Returns:
+        L (array): lower triangular factor
+    """
+    try:
+        return np.linalg.cholesky(rho)
+    except np.linalg.LinAlgError:
+        eigval, eigvec = np.linalg.eigh(rho)
+        rho = (eigvec * np.maximum(eigval, 1e-10)) @ eigvec.T
+        d = np.sqrt(np.diag(rho))
+        return np.linalg.cholesky(rho / np.outer(d, d))
+
+
+def _from_normal(dist, z):
+    """x = F^{-1}(Phi(z)), upper tail through the survival functions"""
+    return np.where(z < 0,
+                    dist.ppf(stats.norm.cdf(z)),
+                    dist.isf(stats.norm.sf(z)))
+
@@ -0,0 +1,232 @@
+"""Polynomial chaos expansion surrogate of a function of random variables"""
+from itertools import product
+from math import factorial
+import numpy as np
+from scipy import special
+from .evaluate import evaluate
+from . import montecarlo
+
+
+class PolynomialChaos(object):
+    """Polynomial chaos expansion built on a StochasticModel
+
+        g(x) ~ sum_k c_k Psi_k(xi(x))
+
+    where Psi_k are products of one dimensional polynomials orthonormal
+    with respect to the germ xi of each variable:
+
+        'hermite': standard normal germ, xi = Phi^{-1}(F(x)), used for
+            normal variables and, by isoprobabilistic transform, for all
+            variables without a better match
+        'legendre': uniform germ in [-1, 1], for uniform variables
+        'laguerre': exponential germ, for exponential variables
+
+    The variables are treated as independent. Because the basis is
+    orthonormal, the mean is c_0, the variance is sum_{k>0} c_k**2 and
+    the Sobol indices are sums of squared coefficients.
+
+    The expansion can stand in for the limit state, it is called as
+    g(X_1, ..., X_n) with scalars or arrays.
+
+    Args:
+        X (object): random variables attributes of the stochastic model
+        degree (int): maximum total degree of the polynomials
+        basis (list): polynomial family of each variable, matched to the
+            distributions if None
+    """
+    def __init__(self, X, degree=3, basis=None):
+        self.X = X
+        self.degree = degree
+        if basis is None:
+            basis = [{'uniform': 'legendre', 'expon': 'laguerre'}.get(
+                name, 'hermite') for name in X.dist_name]
+        self.basis = basis
+        n = len(X.dist_name)
+        self.indices = np.array([k for k in product(range(degree + 1),
+                                                    repeat=n)
+                                 if sum(k) <= degree])
+        self.indices = self.indices[np.argsort(self.indices.sum(axis=1),
+                                               kind='stable')]
+        self.coef = np.zeros(len(self.indices))
+
+    def germ(self, x):
+        """Map samples of X to the germ of each polynomial family"""
+        x = np.atleast_2d(np.asarray(x, dtype=float))
+        xi = np.empty(x.shape)
+        for i, (family, name) in enumerate(zip(self.basis, self.X.dist_name)):
+            dist = self.X.dist_func[i]
+            if family == 'hermite' and name == 'norm':
+                xi[:, i] = (x[:, i] - self.X.mean[i]) / self.X.std[i]
+            elif family == 'hermite':
+                xi[:, i] = special.ndtri(dist.cdf(x[:, i]))
+            elif family == 'legendre':
+                a, b = dist.support()
+                xi[:, i] = 2 * (x[:, i] - a) / (b - a) - 1
+            elif family == 'laguerre':
+                xi[:, i] = (x[:, i] - dist.support()[0]) / dist.std()
+            else:
+                raise ValueError('basis {} not implemented'.format(family))
+        return xi
+
+    def design_matrix(self, x):
+        """Psi_k evaluated at each sample, shape (num_samples, P)"""
+        xi = self.germ(x)
+        Psi = np.ones((len(xi), len(self.indices)))
+        for i, family in enumerate(self.basis):
+            values = _orthonormal(family, xi[:, i], self.degree)
+            Psi *= values[:, self.indices[:, i]]
+        return Psi
+
+    def fit(self, x, y, method='lstsq'):
+        """Fit the coefficients from samples of the function
+
+        Args:
+            x (array): samples of X, each row is a sample
+            y (array): function values at the samples
+            method (str): 'lstsq' for least squares on the full basis,
+                'lars' for the hybrid least angle regression, which keeps
+                the basis subset ordered by LARS with the smallest
+                leave-one-out error
+
+        Returns:
+            self
+        """
+        Psi = self.design_matrix(x)
+        y = np.asarray(y, dtype=float)
+        if method == 'lstsq':
+            self.coef = np.linalg.lstsq(Psi, y, rcond=None)[0]
+        elif method == 'lars':
+            self.coef = _hybrid_lars(Psi, y)
+        else:
+            raise ValueError('method {} not implemented'.format(method))
+        return self
+
+    def train(self, limit_state, num_samples=200, method='lstsq', seed=None):
+        """Fit the expansion to limit state evaluations at random samples
+
+        The samples are evaluated in one call, see evaluate.
+
+        Args:
+            limit_state (function): g(X_1, ..., X_n)
+            num_samples (int): number of evaluations of the limit state
+            method (str): see fit
+            seed: seed for the random number generator
+
+        Returns:
+            self
+        """
+        x = montecarlo.sample(self.X, num_samples, seed)
+        return self.fit(x, evaluate(limit_state, x), method)
+
+    def predict(self, x):
+        """Expansion evaluated at each row of x"""
+        return self.design_matrix(x) @ self.coef
+
+    def __call__(self, *x):
+        if all(np.ndim(xi) == 0 for xi in x):
+            return self.predict(np.array([x]))[0]
+        return self.predict(np.column_stack(np.broadcast_arrays(*x)))
+
+    @property
+    def mean(self):
+        return self.coef[0]
+
+    @property
+    def variance(self):
+        return np.sum(self.coef[1:]**2)
+
+    def sobol(self):
+        """First order and total Sobol indices of each variable
+
+        Returns:
+            first (array): first order indices
+            total (array): total indices
+        """
+        c2 = self.coef**2
+        active = self.indices > 0
+        only = active & (active.sum(axis=1) == 1)[:, None]
+        return c2 @ only / self.variance, c2 @ active / self.variance
+
+
+def _orthonormal(family, xi, degree):
+    """Orthonormal polynomials of degree 0, ..., degree at xi"""
+    P = np.ones((len(xi), degree + 1))
+    if degree == 0:
+        return P
+    if family == 'hermite':
+        # He_{k+1} = xi He_k - k He_{k-1}
+        P[:, 1] = xi
+        for k in range(1, degree):
+            P[:, k + 1] = xi * P[:, k] - k * P[:, k - 1]
+        return P / np.sqrt([factorial(k) for k in range(degree + 1)])
+    if family == 'legendre':
+        # (k+1) P_{k+1} = (2k+1) xi P_k - k P_{k-1}
+        P[:, 1] = xi
+        for k in range(1, degree):
+            P[:, k + 1] = ((2 * k + 1) * xi * P[:, k]
+                           - k * P[:, k - 1]) / (k + 1)
+        return P * np.sqrt(2 * np.arange(degree + 1) + 1)
+    # laguerre (k+1) L_{k+1} = (2k+1-xi) L_k - k L_{k-1}
+    P[:, 1] = 1 - xi
+    for k in range(1, degree):
+        P[:, k + 1] = ((2 * k + 1 - xi) * P[:, k]
+                       - k * P[:, k - 1]) / (k + 1)
+    return P
+
+
+def _lars_order(Psi, y):
+    """Order in which least angle regression activates the columns
+
+    The first column, the constant, is excluded and always kept.
+    """
+    A = Psi[:, 1:] - Psi[:, 1:].mean(axis=0)
+    norm = np.linalg.norm(A, axis=0)
+    A = A / np.where(norm > 0, norm, 1)
+    r = y - y.mean()
+    num_steps = min(A.shape[1], A.shape[0] - 2)
+
+    active = []
+    mu = np.zeros(len(y))
+    c = A.T @ r
+    active.append(int(np.argmax(np.abs(c))))
+    while len(active) < num_steps:
+        c = A.T @ (r - mu)
+        C = np.max(np.abs(c[active]))
+        s = np.sign(c[active])
+        Xa = A[:, active] * s
+        G_inv_1 = np.linalg.lstsq(Xa.T @ Xa, np.ones(len(active)),
+                                  rcond=None)[0]
+        Aa = 1 / np.sqrt(np.sum(G_inv_1))
+        u = Xa @ (Aa * G_inv_1)
+        a = A.T @ u
+
+        inactive = np.setdiff1d(np.arange(A.shape[1]), active)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gamma = np.concatenate([(C - c[inactive]) / (Aa - a[inactive]),
+                                    (C + c[inactive]) / (Aa + a[inactive])])
+        gamma = np.where(gamma > 1e-12, gamma, np.inf)
+        j = int(np.argmin(gamma))
+        if not np.isfinite(gamma[j]):
+            break
+        mu = mu + gamma[j] * u
+        active.append(int(inactive[j % len(inactive)]))
+    return [0] + [k + 1 for k in active]
+
+
+def _hybrid_lars(Psi, y):
+    """Least squares on the LARS subset with smallest leave-one-out error"""
+    order = _lars_order(Psi, y)
+    best_error, best = np.inf, None
+    for k in range(1, len(order) + 1):
+        columns = order[:k]
+        A = Psi[:, columns]
+        Q, R = np.linalg.qr(A)
+        coef = np.linalg.solve(R, Q.T @ y)
+        h = np.sum(Q**2, axis=1)
+        residual = (y - A @ coef) / (1 - h)
+        error = np.mean(residual**2)
+        if error < best_error:
+            best_error, best = error, (columns, coef)
+    coef = np.zeros(Psi.shape[1])
+    coef[best[0]] = best[1]
+    return coef
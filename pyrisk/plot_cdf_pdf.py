@@ -1,25 +1,28 @@
 # Author: Nasser S. Alkmim 2017
 import numpy as np
 import matplotlib.pyplot as plt
-from mean import mean
-from variance import variance
-from integral import trapezoidal
+from .distributions import Tabulated
+from .mean import mean
+from .variance import variance
+from .integral import trapezoidal
 
 
 def cdf_from_pdf(func, interval, num_points=20):
     """Computes a discrete comulative distribution function
 
+    The pdf is tabulated and accumulated once, see Tabulated, and the
+    cdf is interpolated at the num_points abscissae.
+
     Returns:
         cdf (list): [x, F(x)]
     """
     a, b = interval[0], interval[1]
 
     x = np.linspace(a, b, num_points)
-    F = [0]
-    for xi in x[1:]:
-        F.append(trapezoidal(func, interval=[a, xi], num_division=100))
+    table = Tabulated(func, interval, max(num_points, 2001))
+    F = table.cdf(x) * table.total
 
-    return [list(x), F]
+    return [list(x), list(F)]
 
 
 def plot_pdf_and_cdf(func,
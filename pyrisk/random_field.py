@@ -0,0 +1,169 @@
+"""This module discretizes random fields with the Karhunen-Loeve expansion"""
+import numpy as np
+from scipy.sparse.linalg import eigsh
+from scipy.spatial.distance import cdist
+from .stochastic_model import StochasticModel
+
+
+kernels = {'exponential': lambda d: np.exp(- d),
+           'gaussian': lambda d: np.exp(- d**2)}
+
+
+def correlation_matrix(coords_a, coords_b, kernel='exponential', length=1.):
+    """Correlation between the points of two sets of coordinates
+
+    Args:
+        coords_a (array): m by d coordinates
+        coords_b (array): p by d coordinates
+        kernel (str or function): name in kernels or function of the
+            scaled distance
+        length (float or array): correlation length, one for each
+            coordinate for anisotropic fields
+
+    Returns:
+        rho (array): m by p correlation coefficients
+    """
+    kernel = kernels.get(kernel, kernel)
+    coords_a = np.reshape(coords_a, (len(coords_a), -1)) / length
+    coords_b = np.reshape(coords_b, (len(coords_b), -1)) / length
+    return kernel(cdist(coords_a, coords_b))
+
+
+class RandomField(object):
+    """Random field discretized with the truncated Karhunen-Loeve expansion
+
+    The field at the mesh coordinates is written in terms of n_terms
+    independent standard normal variables xi,
+
+       H(x) = mean + std sum_k sqrt(lambda_k) phi_k(x) xi_k
+
+    where lambda_k, phi_k are the largest eigenpairs of the correlation
+    matrix of the coordinates. The number of terms is n_terms, or the
+    smallest number whose eigenvalues sum to energy of the variance,
+    with 'eigsh' the number of computed eigenpairs is doubled from 100
+    until they do.
+
+    Methods:
+        'dense': all eigenpairs of the m by m correlation matrix
+        'eigsh': only the largest eigenpairs with the Lanczos algorithm
+        'nystrom': eigenpairs of the correlation of num_points random
+            coordinates extended to the whole mesh, the expansion
+            optimal linear estimation (EOLE), the m by m matrix is
+            never built so it is suited for large meshes
+
+    For dist 'lognorm' the field is exp of a gaussian field with the
+    kernel correlation and the mean and std of the lognormal field.
+
+    Args:
+        coords (array): m by d mesh coordinates
+        mean (float or array): mean of the field
+        std (float or array): standard deviation of the field
+        kernel (str or function): name in kernels or function of the
+            scaled distance
+        length (float or array): correlation length
+        n_terms (int): number of terms of the expansion
+        energy (float): fraction of the variance kept if n_terms is None
+        method (str): 'eigsh', 'dense' or 'nystrom'
+        dist (str): 'norm' or 'lognorm'
+        num_points (int): number of points of the nystrom method
+        seed: seed for the choice of the nystrom points
+
+    Attributes:
+        eigval (array): eigenvalues of the expansion
+        basis (array): m by n_terms matrix sqrt(lambda_k) phi_k(x)
+    """
+    def __init__(self, coords, mean, std, kernel='exponential', length=1.,
+                 n_terms=None, energy=.95, method='eigsh', dist='norm',
+                 num_points=500, seed=None):
+        self.coords = np.reshape(coords, (len(coords), -1))
+        m = len(self.coords)
+        self.kernel = kernel
+        self.length = length
+        self.dist = dist
+        if dist == 'norm':
+            self.mean, self.std = mean, std
+        elif dist == 'lognorm':
+            mean, std = np.asarray(mean, float), np.asarray(std, float)
+            self.std = np.sqrt(np.log(std**2 / mean**2 + 1))
+            self.mean = np.log(mean) - self.std**2 / 2
+        else:
+            raise ValueError('dist {} not implemented'.format(dist))
+
+        if method == 'nystrom':
+            rng = np.random.default_rng(seed)
+            points = rng.choice(m, min(num_points, m), replace=False)
+            eigval, eigvec = np.linalg.eigh(self.correlation(points, points))
+            eigval, eigvec = eigval[::-1], eigvec[:, ::-1]
+            # eigenvalues of the m by m correlation, sum(eigval) = m
+            eigval = eigval * m / len(points)
+        else:
+            rho = self.correlation()
+            if method == 'dense':
+                eigval, eigvec = np.linalg.eigh(rho)
+            elif method == 'eigsh':
+                k = n_terms if n_terms is not None else min(m - 1, 100)
+                eigval, eigvec = eigsh(rho, k=k)
+                # without n_terms, more eigenpairs until they hold energy
+                # of the variance, all of them when k reaches m
+                while n_terms is None and eigval.sum() / m < energy:
+                    k = 2 * k
+                    if k >= m - 1:
+                        eigval, eigvec = np.linalg.eigh(rho)
+                        break
+                    eigval, eigvec = eigsh(rho, k=k)
+            else:
+                raise ValueError('method {} not implemented'.format(method))
+            eigval, eigvec = eigval[::-1], eigvec[:, ::-1]
+
+        if n_terms is None:
+            n_terms = np.searchsorted(np.cumsum(eigval) / m, energy) + 1
+            n_terms = min(n_terms, len(eigval))
+        self.n_terms = n_terms
+        self.eigval = eigval[:n_terms]
+
+        if method == 'nystrom':
+            s = eigval[:n_terms] * len(points) / m
+            self.basis = (self.correlation(None, points)
+                          @ (eigvec[:, :n_terms] / np.sqrt(s)))
+        else:
+            self.basis = eigvec[:, :n_terms] * np.sqrt(self.eigval)
+
+    def correlation(self, rows=None, columns=None):
+        """Correlation matrix between the coordinates of rows and columns
+
+        Args:
+            rows (array): indices of the coordinates, None for all
+            columns (array): indices of the coordinates, None for all
+
+        Returns:
+            rho (array): correlation coefficients
+        """
+        a = self.coords if rows is None else self.coords[rows]
+        b = self.coords if columns is None else self.coords[columns]
+        return correlation_matrix(a, b, self.kernel, self.length)
+
+    def realize(self, xi):
+        """Field at the coordinates for the standard normal variables xi
+
+        All realizations are computed as one matrix product.
+
+        Args:
+            xi (array): n_terms or num_realizations by n_terms
+
+        Returns:
+            h (array): m or num_realizations by m values of the field
+        """
+        h = self.mean + self.std * (np.asarray(xi) @ self.basis.T)
+        if self.dist == 'lognorm':
+            return np.exp(h)
+        return h
+
+    def sample(self, num_simulations, rng=None):
+        """Realizations of the field for random xi"""
+        xi = np.random.default_rng(rng).standard_normal(
+            (num_simulations, self.n_terms))
+        return self.realize(xi)
+
+    def stochastic_model(self):
+        """StochasticModel of the n_terms standard normal variables xi"""
+        return StochasticModel(*[['norm', 0, 1]] * self.n_terms)
@@ -0,0 +1,179 @@
+"""This module performs the RBDO - reliability based design optimization"""
+import numpy as np
+from scipy import optimize
+from .cache import CachedLimitState
+from .derivative import derivative
+from .evaluate import CountedLimitState
+from .form_ihlrf import FormResult
+
+
+def inverse_form(limit_state, X, beta_target, u0=None, tol=1e-4,
+                 max_iterations=100, gradient=derivative):
+    """Performs the inverse FORM with the AMV+ algorithm (PMA)
+
+    The performance measure approach finds the minimum of the limit state
+    on the sphere ||u|| = beta_target of the standard normal space,
+
+       g_p = min g(u) subject to ||u|| = beta_target
+
+    so the constraint g_p >= 0 is equivalent to beta >= beta_target. The
+    advanced mean value iteration moves to the point of the sphere
+    opposite to the gradient,
+
+       u_{k+1} = - beta_target grad_g_u(u_k) / ||grad_g_u(u_k)||
+
+    until the point moves less than tol beta_target.
+
+    Args:
+        limit_state (function): g(X_1, ..., X_n)
+        X (object): random variables attributes of the stochastic model
+        beta_target (float): target reliability index
+        u0 (array): starting point in the standard normal space, e.g. the
+            most probable point of a previous design, origin if None
+        tol (float): tolerance on the most probable point
+        max_iterations (int): maximum number of iterations
+        gradient (function): gradient provider, see derivative module
+
+    Returns:
+        result (object): FormResult with the most probable point, g is
+            the percentile performance g_p and beta is beta_target
+    """
+    g_counted = CountedLimitState(limit_state)
+    _, L = X.nataf()
+
+    if u0 is None:
+        u = np.zeros(len(X.dist_func))
+    else:
+        u = np.array(u0, dtype=float)
+
+    def grad_u_at(x, g):
+        _, std = X.equivalent_normal(x)
+        return L.T @ (std * gradient(g_counted, x, g0=g))
+
+    x = X.to_physical(u)
+    g = g_counted(*x)
+    grad_u = grad_u_at(x, g)
+
+    history = []
+    converged = False
+    for iteration in range(1, max_iterations + 1):
+        u_updt = - beta_target * grad_u / np.linalg.norm(grad_u)
+        x_updt = X.to_physical(u_updt)
+        g_updt = g_counted(*x_updt)
+        grad_u_updt = grad_u_at(x_updt, g_updt)
+        step = np.linalg.norm(u_updt - u)
+        history.append((beta_target, g_updt, step))
+
+        converged = step <= tol * max(1, beta_target)
+        u, x, g, grad_u = u_updt, x_updt, g_updt, grad_u_updt
+        if converged:
+            break
+
+    return FormResult(x=x, u=u, beta=beta_target,
+                      alpha=- grad_u / np.linalg.norm(grad_u), g=g,
+                      grad_u=grad_u, iterations=iteration, history=history,
+                      num_g=g_counted.count, num_grad=iteration + 1,
+                      converged=converged)
+
+
+def rbdo(cost, limit_states, model, d0, beta_target, bounds=None,
+         method='sora', tol=1e-4, max_cycles=20, gradient=derivative,
+         quantum=None):
+    """Reliability based design optimization with inverse FORM
+
+       min cost(d) subject to beta_i(d) >= beta_target_i
+
+    where the design variables d set the stochastic model, e.g. the means
+    of the random variables, X = model(d). The reliability constraints
+    are replaced by the percentile performances of inverse_form, g_p >= 0.
+
+    Methods:
+        'double_loop': SLSQP with the percentile performances as
+            constraints, each evaluation of the constraints solves the
+            inverse FORM of every limit state
+        'sora': sequential optimization and reliability assessment, the
+            cycles alternate a deterministic optimization with the
+            constraints shifted by s_i = mean - x_i*, from the most
+            probable points x_i* of the last design, and one inverse FORM
+            of each limit state, until the design stops changing
+
+    Each inverse FORM starts from the most probable point of the previous
+    one, and the limit states are wrapped in a CachedLimitState, so the
+    points repeated by the optimizer, e.g. by the finite differences of
+    the constraints, are evaluated once.
+
+    Args:
+        cost (function): cost(d)
+        limit_states (list): limit states g_i(X_1, ..., X_n)
+        model (function): model(d) returns the StochasticModel of design d
+        d0 (array): initial design
+        beta_target (float or array): target reliability index of each
+            limit state
+        bounds (list): (min, max) of each design variable
+        method (str): 'sora' or 'double_loop'
+        tol (float): tolerance on the design and of the optimizer
+        max_cycles (int): maximum number of SORA cycles
+        gradient (function): gradient provider, see derivative module
+        quantum (float or array): resolution of the limit state cache
+
+    Returns:
+        d (array): optimum design
+        performance (array): percentile performance g_p of each limit
+            state at d
+        num_g (int): number of limit state evaluations
+    """
+    cached = [CachedLimitState(g, quantum) for g in limit_states]
+    beta_target = np.broadcast_to(np.asarray(beta_target, dtype=float),
+                                  len(cached))
+    mpp = [None] * len(cached)
+
+    def pma(d):
+        X = model(d)
+        results = [inverse_form(g, X, beta, u0=u, tol=tol, gradient=gradient)
+                   for g, beta, u in zip(cached, beta_target, mpp)]
+        mpp[:] = [r.u for r in results]
+        return X, results
+
+    if method == 'double_loop':
+        solved = {}
+
+        def performance(d):
+            key = tuple(d)
+            if key not in solved:
+                solved[key] = np.array([r.g for r in pma(d)[1]])
+            return solved[key]
+
+        d = optimize.minimize(cost, d0, method='SLSQP', bounds=bounds,
+                              constraints={'type': 'ineq',
+                                           'fun': performance},
+                              options={'ftol': tol}).x
+        g_p = performance(d)
+    elif method == 'sora':
+        d = np.asarray(d0, dtype=float)
+        for cycle in range(max_cycles):
+            X, results = pma(d)
+            if cycle and np.linalg.norm(d - d_previous) <= tol * max(
+                    1, np.linalg.norm(d)):
+                break
+            constraints = [{'type': 'ineq',
+                            'fun': _Shifted(g, model, X.mean - r.x)}
+                           for g, r in zip(cached, results)]
+            d_previous = d
+            d = optimize.minimize(cost, d, method='SLSQP', bounds=bounds,
+                                  constraints=constraints,
+                                  options={'ftol': tol}).x
+        g_p = np.array([r.g for r in results])
+    else:
+        raise ValueError('method {} not implemented'.format(method))
+    return d, g_p, sum(g.misses for g in cached)
+
+
+class _Shifted(object):
+    """Deterministic SORA constraint g(mean(d) - shift)"""
+    def __init__(self, limit_state, model, shift):
+        self.limit_state = limit_state
+        self.model = model
+        self.shift = shift
+
+    def __call__(self, d):
+        return self.limit_state(*(self.model(d).mean - self.shift))
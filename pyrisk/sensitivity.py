@@ -0,0 +1,127 @@
+"""This module computes sensitivity measures of the random variables"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
+from .evaluate import evaluate
+from .form_hlrf_correlation import form_hlrf_correlation
+from .montecarlo import _standard_normal
+
+
+def sobol_indices(func, X, num_samples=1024, method='sobol',
+                  chunk_size=100000, num_bootstrap=100, confidence=.95,
+                  seed=None, processes=None):
+    """First order and total Sobol indices of func(X)
+
+    Two independent standard normal sample matrices A and B (num_samples
+    by n) are drawn, and AB_i is A with the column i from B. With the
+    Saltelli and Jansen estimators,
+
+        S_i = mean(f(B) (f(AB_i) - f(A))) / V
+        ST_i = mean((f(A) - f(AB_i))**2) / (2 V)
+
+    where V is the variance of f over A and B, so num_samples (n + 2)
+    evaluations are needed. A, B and the num_samples (n + 2) values of f
+    are kept, so the memory grows with num_samples n, but the AB_i
+    matrices are never stacked: their rows are built and evaluated in
+    chunks of chunk_size, mapped to the physical space with
+    X.to_physical. With correlated
+    variables the indices refer to the independent standard normal
+    variables of the Nataf transformation.
+
+    The confidence intervals are percentiles of num_bootstrap resamples
+    of the rows, one variable at a time so only num_bootstrap by
+    num_samples values are kept.
+
+    Args:
+        func (function): f(X_1, ..., X_n)
+        X (object): random variables attributes of the stochastic model
+        num_samples: number of rows of A and B
+        method: 'random', or quasi random 'sobol', 'halton' or 'lhs'
+        chunk_size: number of rows evaluated at once
+        num_bootstrap: number of bootstrap resamples
+        confidence: confidence level of the intervals
+        seed: seed for the random number generator
+        processes: number of worker processes, None runs serially
+
+    Returns:
+        S (array): first order indices
+        ST (array): total indices
+        S_ci (array): 2 by n lower and upper confidence limits of S
+        ST_ci (array): 2 by n lower and upper confidence limits of ST
+    """
+    n = len(X.dist_func)
+    N = num_samples
+    rng = np.random.default_rng(seed)
+    AB = _standard_normal(N, rng, method, 2 * n)
+    A, B = AB[:, :n], AB[:, n:]
+
+    total = (n + 2) * N
+    starts = range(0, total, chunk_size)
+    stops = [min(start + chunk_size, total) for start in starts]
+    rows = partial(_evaluate_rows, func, X, A, B)
+    if processes is None or processes == 1:
+        f = np.concatenate(list(map(rows, starts, stops)))
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            f = np.concatenate(list(pool.map(
+                rows, starts, stops,
+                chunksize=max(1, len(stops) // (4 * processes)))))
+    f_A, f_B, f_AB = f[:N], f[N:2 * N], f[2 * N:].reshape(n, N)
+
+    V = np.var(np.concatenate([f_A, f_B]))
+    S, ST = _indices(f_A, f_B, f_AB, V)
+
+    index = rng.integers(N, size=(num_bootstrap, N))
+    f_A, f_B = f_A[index], f_B[index]
+    V = np.var(np.concatenate([f_A, f_B], axis=-1), axis=-1)
+    q = [50 * (1 - confidence), 50 * (1 + confidence)]
+    S_ci, ST_ci = np.empty((2, n)), np.empty((2, n))
+    for i in range(n):
+        S_boot, ST_boot = _indices(f_A, f_B, f_AB[i][index], V)
+        S_ci[:, i] = np.percentile(S_boot, q)
+        ST_ci[:, i] = np.percentile(ST_boot, q)
+    return S, ST, S_ci, ST_ci
+
+
+def _indices(f_A, f_B, f_AB, V):
+    """Saltelli first order and Jansen total estimators along last axis"""
+    S = np.mean(f_B * (f_AB - f_A), axis=-1) / V
+    ST = np.mean((f_A - f_AB)**2, axis=-1) / (2 * V)
+    return S, ST
+
+
+def _evaluate_rows(func, X, A, B, start, stop):
+    """Evaluate the rows start to stop of the stacked [A; B; AB_1; ...]"""
+    N = len(A)
+    block, row = np.divmod(np.arange(start, stop), N)
+    u = np.where((block == 1)[:, None], B[row], A[row])
+    ab = np.nonzero(block >= 2)[0]
+    u[ab, block[ab] - 2] = B[row[ab], block[ab] - 2]
+    return evaluate(func, X.to_physical(u))
+
+
+def importance_factors(limit_state, X, x=None, **kwargs):
+    """FORM importance factors alpha_i**2 of the random variables
+
+    alpha = u*/beta is the unit vector to the design point u* in the
+    standard space, the importance factors sum to one and give the
+    share of each variable in the variance of the linearized limit
+    state. They cost one FORM analysis, so they are a cheap screen
+    before sobol_indices or a reliability analysis, variables with
+    small factors may be replaced by their means.
+
+    Args:
+        limit_state (function): g(X_1, ..., X_n)
+        X (object): random variables attributes of the stochastic model
+        x (array): design point, if None form_hlrf_correlation is
+            performed
+        **kwargs: options passed to form_hlrf_correlation
+
+    Returns:
+        importance (array): alpha_i**2
+        x (array): design point
+    """
+    if x is None:
+        x, _, _ = form_hlrf_correlation(limit_state, X, **kwargs)
+    u = X.to_standard(np.asarray(x, dtype=float))
+    return u**2 / (u @ u), x
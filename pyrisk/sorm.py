@@ -0,0 +1,125 @@
+"""This module performs the SORM - second order reliability method"""
+import numpy as np
+from scipy import stats
+from .derivative import derivative, hessian
+from .evaluate import evaluate
+from .form_ihlrf import form_ihlrf
+
+
+def sorm(limit_state, X, form=None, x=None, method='curvature', eps=1e-4,
+         gradient=derivative):
+    """Second order correction of the FORM probability of failure
+
+    The limit state is approximated at the design point u* = beta alpha
+    by a paraboloid in the rotated standard space u' = R u, where the
+    last axis of R is alpha,
+
+       u'_n = beta + 1/2 sum_i kappa_i u'_i**2
+
+    The main curvatures kappa_i are computed with:
+
+        'curvature': eigenvalues of A = R H R.T / ||grad_g_u|| without the
+            last row and column. The Hessian H of g(u) is from central
+            differences with step eps, the 2n**2 points in one limit
+            state call, reusing g and its gradient at the design point
+        'point_fitting': the paraboloid through 2(n - 1) points of the
+            limit state surface at u'_i = +-k, found with one Newton
+            step from u'_n = beta, in one limit state call. kappa_i is
+            the mean of the curvatures of the two sides
+
+    and the probability of failure with the formulas of Breitung,
+    Hohenbichler and Rackwitz and Tvedt.
+
+    Args:
+        limit_state (function): g(X_1, ..., X_n)
+        X (object): random variables attributes of the stochastic model
+        form (object): FormResult from form_ihlrf
+        x (array): design point in the physical space, e.g. from
+            form_hlrf_correlation, used if form is None. If both are
+            None form_ihlrf is performed
+        method (str): 'curvature' or 'point_fitting'
+        eps (float): finite difference step in the standard space
+        gradient (function): gradient provider, see derivative module
+
+    Returns:
+        pf_breitung (float): Breitung probability of failure
+        pf_hohenbichler (float): Hohenbichler and Rackwitz probability
+        pf_tvedt (float): Tvedt probability of failure
+        kappa (array): main curvatures
+    """
+    _, L = X.nataf()
+
+    if x is not None and form is None:
+        x = np.asarray(x, dtype=float)
+        u_star = X.to_standard(x)
+        g0 = limit_state(*x)
+        _, std = X.equivalent_normal(x)
+        grad_u = L.T @ (std * gradient(limit_state, x, g0=g0))
+    else:
+        if form is None:
+            form = form_ihlrf(limit_state, X, gradient=gradient)
+        u_star, g0, grad_u = form.u, form.g, form.grad_u
+
+    n = len(u_star)
+    norm = np.linalg.norm(grad_u)
+    alpha = - grad_u / norm
+    beta = alpha @ u_star
+    R = _rotation(alpha)
+
+    if method == 'curvature':
+        H, _, _ = hessian(_InStandardSpace(limit_state, X), u_star, eps, g0)
+        A = R @ H @ R.T / norm
+        kappa = np.linalg.eigvalsh(A[:-1, :-1])
+    elif method == 'point_fitting':
+        k = min(max(abs(beta), 1), 3)
+        sides = np.vstack([k * np.identity(n)[:-1], -k * np.identity(n)[:-1]])
+        sides[:, -1] = beta
+        g = evaluate(limit_state, X.to_physical(sides @ R))
+        # one Newton step along the last axis, dg/du'_n = -||grad_g_u||
+        eta = beta + g / norm
+        a = 2 * (eta - beta) / k**2
+        kappa = (a[:n - 1] + a[n - 1:]) / 2
+    else:
+        raise ValueError('method {} not implemented'.format(method))
+
+    return _probabilities(beta, kappa) + (kappa,)
+
+
+class _InStandardSpace(object):
+    """Limit state g(u) of the standard normal variables"""
+    def __init__(self, limit_state, X):
+        self.limit_state = limit_state
+        self.X = X
+
+    def __call__(self, *u):
+        x = self.X.to_physical(np.array(u, dtype=float).T)
+        return self.limit_state(*x.T)
+
+
+def _rotation(alpha):
+    """Orthogonal matrix R with last row alpha (Householder reflection)"""
+    n = len(alpha)
+    e = np.zeros(n)
+    e[-1] = 1
+    v = alpha - e
+    if np.linalg.norm(v) < 1e-12:
+        return np.identity(n)
+    v = v / np.linalg.norm(v)
+    return np.identity(n) - 2 * np.outer(v, v)
+
+
+def _probabilities(beta, kappa):
+    """Breitung, Hohenbichler and Rackwitz and Tvedt formulas"""
+    Phi, phi = stats.norm.cdf(-beta), stats.norm.pdf(beta)
+    psi = phi / Phi
+    breitung = Phi * np.prod(1 / np.sqrt(1 + beta * kappa))
+    hohenbichler = Phi * np.prod(1 / np.sqrt(1 + psi * kappa))
+
+    A1 = breitung
+    A2 = ((beta * Phi - phi)
+          * (np.prod(1 / np.sqrt(1 + beta * kappa))
+             - np.prod(1 / np.sqrt(1 + (beta + 1) * kappa))))
+    A3 = ((beta + 1) * (beta * Phi - phi)
+          * (np.prod(1 / np.sqrt(1 + beta * kappa))
+             - np.real(np.prod(1 / np.sqrt(1 + (beta + 1j) * kappa)))))
+    return breitung, hohenbichler, A1 + A2 + A3
@@ -1,23 +1,48 @@
 """Creates a stochastic model class with random variable attributes"""
-from scipy import stats
+import warnings
+from scipy import stats, special, linalg
 import numpy as np
+from .distributions import families
+from .nataf import nataf_correlation, cholesky
 
 
 class StochasticModel(object):
     """Creates an object with random variable attributes
 
+    The model is immutable, the mean, std and rho arrays are read only
+    and dist_func and dist_name are tuples, so it can be shared between
+    threads and analyses. The correlation is set with the rho argument,
+    with_correlation returns a new model with one more correlation.
+
+    Variables of the same distribution family are grouped, so the
+    transformations between the physical space x and the standard
+    normal space u work on whole arrays of points at once.
+
     Args:
-        list with: [distribution, mean, std]
+        list with: [distribution, mean, std] or [distribution object],
+            e.g. a Tabulated distribution, with pdf, cdf, ppf, sf, isf,
+            mean and std methods
+        rho (array): correlation matrix, identity if None
     """
-    def __init__(self, *args):
+    def __init__(self, *args, rho=None):
+        self._args = args
         self.dist_func = []
         mean = []
         std = []
         self.dist_name = []
 
-        for dist, mu, sig in args:
+        for dist, *moments in args:
+
+            if not isinstance(dist, str):
+                mu, sig = float(dist.mean()), float(dist.std())
+                self.dist_func.append(dist)
+                self.dist_name.append(type(dist).__name__.lower())
+                mean.append(mu)
+                std.append(sig)
+                continue
 
-            if dist is 'lognorm':
+            mu, sig = moments
+            if dist == 'lognorm':
                 """scipy lognormal
 
                 Y -> LN(mu_Y, sig_Y)
@@ -33,7 +58,7 @@ class StochasticModel(object):
                 scale = np.exp(np.log(mu) - .5 * s**2)
                 self.dist_func.append(stats.lognorm(s=s, scale=scale))
 
-            elif dist is 'gumbel_r':
+            elif dist == 'gumbel_r':
                 """scipy gumbel right skw aka extreme type I
 
                 f(x) = exp(-(x-loc)1/scale) exp(-exp(-(x-loc)1/scale))
@@ -52,17 +77,186 @@ class StochasticModel(object):
             mean.append(mu)
             std.append(sig)
 
-        self.mean = np.array(mean)
-        self.std = np.array(std)
-        self.rho = np.identity(len(args))
+        self.dist_func = tuple(self.dist_func)
+        self.dist_name = tuple(self.dist_name)
+        self.mean = _read_only(mean)
+        self.std = _read_only(std)
+        self.rho = _read_only(np.identity(len(args)) if rho is None else rho)
+        self._nataf = None
 
-    def add_correlation(self, var1: int, var2: int, rho: float):
-        """Modify the correlation matrix rho
+        # one distribution with array parameters for each family, closed
+        # form kernels for the built-in families and scipy for the others
+        self._groups = []
+        for i, (dist, *_) in enumerate(args):
+            if not isinstance(dist, str):
+                self._groups.append((self.dist_name[i], np.array([i]), dist))
+        for dist in dict.fromkeys(d for d, *_ in args if isinstance(d, str)):
+            idx = np.array([i for i, (name, *_) in enumerate(args)
+                            if name == dist])
+            if dist in families:
+                group = families[dist](self.mean[idx], self.std[idx])
+            else:
+                group = getattr(stats, dist)(loc=self.mean[idx],
+                                             scale=self.std[idx])
+            self._groups.append((dist, idx, group))
+
+    def with_correlation(self, var1: int, var2: int, rho: float):
+        """New model with the correlation between var1 and var2
 
         Args:
-            var1 (int): first variable
-            var2 (int): second variable
+            var1 (int): first variable, starting from 1
+            var2 (int): second variable, starting from 1
             rho (float): correlation betwen var1 and var2
+
+        Returns:
+            X (object): StochasticModel with the updated correlation matrix
+        """
+        new_rho = np.array(self.rho)
+        new_rho[var1 - 1, var2 - 1] = rho
+        new_rho[var2 - 1, var1 - 1] = rho
+        return StochasticModel(*self._args, rho=new_rho)
+
+    def add_correlation(self, var1: int, var2: int, rho: float):
+        """Removed, the model is immutable, use with_correlation
+
+        Raises:
+            TypeError: always, X = X.with_correlation(var1, var2, rho)
+                returns the model with the correlation
+        """
+        message = ('StochasticModel is immutable, use X = X.with_correlation'
+                   '({}, {}, {})'.format(var1, var2, rho))
+        warnings.warn(message, DeprecationWarning, stacklevel=2)
+        raise TypeError(message)
+
+    def nataf(self):
+        """Correlation of the equivalent standard normal variables
+
+        The Nataf correlation and its Cholesky factor are computed once
+        and cached.
+
+        Returns:
+            rho_z (array): correlation matrix in the standard normal space
+            L (array): lower triangular factor with rho_z = L @ L.T
+        """
+        if self._nataf is None:
+            rho_z = nataf_correlation(self)
+            self._nataf = rho_z, cholesky(rho_z)
+        return self._nataf
+
+    def pdf(self, x):
+        """Marginal densities, x has shape (..., n)"""
+        return self._marginal('pdf', x)
+
+    def cdf(self, x):
+        """Marginal cumulative distributions, x has shape (..., n)"""
+        return self._marginal('cdf', x)
+
+    def ppf(self, p):
+        """Marginal inverse cumulative distributions, p has shape (..., n)"""
+        return self._marginal('ppf', p)
+
+    def to_standard(self, x):
+        """Map points in the physical space to the standard normal space
+
+        Each variable is mapped to a standard normal, z_i = Phi^{-1}(F_i(x_i)),
+        and the correlation is removed with the Nataf Cholesky factor,
+        u = L^{-1} z.
+
+        Args:
+            x (array): a point with shape (n,) or points with shape (m, n)
+
+        Returns:
+            u (array): independent standard normal coordinates
+        """
+        z = self._to_normal(x)
+        _, L = self.nataf()
+        u = linalg.solve_triangular(L, z.reshape(-1, len(L)).T, lower=True)
+        return u.T.reshape(z.shape)
+
+    def to_physical(self, u):
+        """Map points in the standard normal space to the physical space
+
+        Inverse of to_standard, z = L u and x_i = F_i^{-1}(Phi(z_i)).
+
+        Args:
+            u (array): a point with shape (n,) or points with shape (m, n)
+
+        Returns:
+            x (array): points in the physical space
         """
-        self.rho[var1 - 1, var2 - 1] = rho
-        self.rho[var2 - 1, var1 - 1] = rho
+        _, L = self.nataf()
+        return self._from_normal(np.asarray(u, dtype=float) @ L.T)
+
+    def equivalent_normal(self, x):
+        """Rackwitz-Fiessler equivalent normal mean and standard deviation
+
+        The normal distribution with the same cdf and pdf as the variable
+        at x, with z = Phi^{-1}(F(x)),
+
+           std = phi(z) / f(x)
+           mean = x - std * z
+
+        computed in log space, exp(log phi(z) - log f(x)), so points far
+        in the tails do not give 0/0. Normal variables keep their mean
+        and standard deviation.
+
+        Args:
+            x (array): a point with shape (n,) or points with shape (m, n)
+
+        Returns:
+            mean (array): equivalent normal means
+            std (array): equivalent normal standard deviations
+        """
+        x = np.asarray(x, dtype=float)
+        z = self._to_normal(x)
+        mean = np.empty(x.shape)
+        std = np.empty(x.shape)
+        for name, idx, dist in self._groups:
+            if name == 'norm':
+                mean[..., idx] = dist.mean()
+                std[..., idx] = dist.std()
+            else:
+                xi, zi = x[..., idx], z[..., idx]
+                std[..., idx] = np.exp(-zi**2 / 2 - np.log(np.sqrt(2 * np.pi))
+                                       - dist.logpdf(xi))
+                mean[..., idx] = xi - std[..., idx] * zi
+        return mean, std
+
+    def _marginal(self, method, values):
+        values = np.asarray(values, dtype=float)
+        out = np.empty(values.shape)
+        for _, idx, dist in self._groups:
+            out[..., idx] = getattr(dist, method)(values[..., idx])
+        return out
+
+    def _to_normal(self, x):
+        """z = Phi^{-1}(F(x)), upper tail through the survival functions"""
+        x = np.asarray(x, dtype=float)
+        z = np.empty(x.shape)
+        for name, idx, dist in self._groups:
+            xi = x[..., idx]
+            if name == 'norm':
+                z[..., idx] = (xi - dist.mean()) / dist.std()
+            else:
+                cdf = dist.cdf(xi)
+                z[..., idx] = np.where(cdf < .5, special.ndtri(cdf),
+                                       -special.ndtri(dist.sf(xi)))
+        return z
+
+    def _from_normal(self, z):
+        """x = F^{-1}(Phi(z)), upper tail through the survival functions"""
+        x = np.empty(z.shape)
+        for name, idx, dist in self._groups:
+            zi = z[..., idx]
+            if name == 'norm':
+                x[..., idx] = dist.mean() + dist.std() * zi
+            else:
+                x[..., idx] = np.where(zi < 0, dist.ppf(special.ndtr(zi)),
+                                       dist.isf(special.ndtr(-zi)))
+        return x
+
+
+def _read_only(values):
+    values = np.array(values, dtype=float)
+    values.setflags(write=False)
+    return values
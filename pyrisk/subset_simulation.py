@@ -0,0 +1,116 @@
+"""Subset simulation for small probabilities of failure (Au and Beck 2001)"""
+import numpy as np
+from .evaluate import evaluate
+
+
+def subset_simulation(limit_state, X, num_samples=1000, p0=.1, spread=1.,
+                      max_levels=20, seed=None):
+    """Estimate the probability of failure by subset simulation
+
+    The failure event {g < 0} is written as a sequence of nested events
+    {g < b_1} > {g < b_2} > ... > {g < 0} with thresholds b_i chosen
+    adaptively so that each conditional probability is about p0,
+
+        pf = p0**(m - 1) * P[g < 0 | g < b_(m-1)]
+
+    The samples of each level are generated with the modified Metropolis
+    algorithm in the standard normal space, starting from the p0 *
+    num_samples samples of the previous level with the smallest g. All
+    chains are advanced together, so the limit state is evaluated once
+    per step for all chains.
+
+    The coefficient of variation accounts for the correlation between
+    the samples of each chain, as proposed by Au and Beck.
+
+    Args:
+        limit_state (function): g(X_1, ..., X_n)
+        X (object): random variables attributes of the stochastic model
+        num_samples: number of samples in each level
+        p0: conditional probability of each level
+        spread: standard deviation of the component-wise proposal
+        max_levels: maximum number of levels
+        seed: seed for the random number generator
+
+    Returns:
+        pf (float): probability of failure
+        levels (list): intermediate thresholds, the last one is 0
+        cov (float): coefficient of variation of pf
+    """
+    rng = np.random.default_rng(seed)
+    num_chains = int(num_samples * p0)
+    chain_length = num_samples // num_chains
+    num_samples = num_chains * chain_length
+
+    u = rng.standard_normal((num_samples, len(X.dist_func)))
+    g = evaluate(limit_state, X.to_physical(u))
+    # each column is a chain, Monte Carlo samples are chains of length 1
+    g_chains = g.reshape(1, -1)
+
+    pf, cov2, levels = 1, 0, []
+    for level in range(max_levels):
+        g_sorted = np.sort(g)
+        threshold = (g_sorted[num_chains - 1] + g_sorted[num_chains]) / 2
+        last = threshold <= 0 or level == max_levels - 1
+        if last:
+            threshold = 0
+
+        indicator = g_chains < threshold
+        p = indicator.mean()
+        levels.append(threshold)
+        pf *= p
+        if p == 0:
+            return 0, levels, np.inf
+        cov2 += (1 - p) / (num_samples * p) * (1 + _gamma(indicator, p))
+        if last:
+            break
+
+        seeds = g < threshold
+        u, g, g_chains = _modified_metropolis(
+            limit_state, X, u[seeds], g[seeds], threshold, chain_length,
+            spread, rng)
+
+    return pf, levels, np.sqrt(cov2)
+
+
+def _modified_metropolis(limit_state, X, u, g, threshold, chain_length,
+                         spread, rng):
+    """Advance all chains together with the component-wise Metropolis step
+
+    Returns the samples and limit state values of all chains and the
+    limit state values with shape (chain_length, num_chains).
+    """
+    samples, values = [u], [g]
+    for step in range(chain_length - 1):
+        candidate = u + spread * rng.standard_normal(u.shape)
+        ratio = np.exp(-(candidate**2 - u**2) / 2)
+        accept = rng.random(u.shape) < ratio
+        candidate = np.where(accept, candidate, u)
+
+        moved = accept.any(axis=1)
+        g_candidate = g.copy()
+        if moved.any():
+            g_candidate[moved] = evaluate(limit_state,
+                                          X.to_physical(candidate[moved]))
+
+        inside = g_candidate < threshold
+        u = np.where(inside[:, None], candidate, u)
+        g = np.where(inside, g_candidate, g)
+        samples.append(u)
+        values.append(g)
+
+    g_chains = np.array(values)
+    return np.concatenate(samples), g_chains.ravel(), g_chains
+
+
+def _gamma(indicator, p):
+    """Correlation factor of the indicator samples along the chains"""
+    chain_length, num_chains = indicator.shape
+    if chain_length == 1 or p == 1:
+        return 0
+    indicator = indicator.astype(float)
+    gamma = 0
+    for k in range(1, chain_length):
+        R = (np.sum(indicator[:-k] * indicator[k:])
+             / (num_chains * (chain_length - k)) - p**2)
+        gamma += 2 * (1 - k / chain_length) * R / (p * (1 - p))
+    return gamma
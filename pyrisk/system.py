@@ -0,0 +1,315 @@
+"""This module computes the reliability of series and parallel systems"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
+from scipy import stats
+from .evaluate import evaluate
+from .form_ihlrf import form_ihlrf
+from .montecarlo import sample, _estimate
+from .nataf import cholesky
+
+
+def components(limit_states, X, processes=None, **kwargs):
+    """Perform FORM on each component limit state
+
+    With processes the components are distributed over a process pool,
+    the limit states and X must be picklable, e.g. defined at module
+    level.
+
+    Args:
+        limit_states (list): component limit states g_i(X_1, ..., X_n)
+        X (object): random variables attributes of the stochastic model
+        processes: number of worker processes, None runs serially
+        **kwargs: options passed to form_ihlrf
+
+    Returns:
+        beta (array): reliability index of each component
+        rho (array): correlation between the linearized components,
+            rho_ij = alpha_i @ alpha_j
+        forms (list): FormResult of each component
+    """
+    form = partial(form_ihlrf, X=X, **kwargs)
+    if processes is None or processes == 1:
+        forms = list(map(form, limit_states))
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            forms = list(pool.map(form, limit_states))
+    beta = np.array([f.beta for f in forms])
+    alpha = np.array([f.alpha for f in forms])
+    return beta, alpha @ alpha.T, forms
+
+
+def multivariate_normal_cdf(b, rho, num_samples=10000, num_replicates=10,
+                            seed=None, complement=False):
+    """Standard multivariate normal probability P[Z_1 < b_1, ..., Z_m < b_m]
+
+    Genz separation of variables: with rho = L @ L.T the probability is
+    an integral over the unit hypercube [0, 1]**(m - 1) of
+
+        f(w) = e_1 e_2 ... e_m,  e_i = Phi((b_i - sum_j<i L_ij y_j)/L_ii)
+
+    with y_j = Phi^{-1}(w_j e_j). The integral is estimated with a
+    randomly shifted Richtmyer lattice rule with the baker's transform,
+    all points of one replicate at once, and the error from the spread
+    between the num_replicates random shifts.
+
+    With complement the probability of the union, 1 - P, is integrated
+    directly as the sum of the disjoint events
+
+        P[Z_i > b_i, Z_j < b_j for j < i]
+
+    each with Z_i first and sampled in its tail, so small probabilities
+    keep their precision instead of being the difference of 1 and a
+    probability close to 1.
+
+    Args:
+        b (array): upper limits
+        rho (array): correlation matrix
+        num_samples: number of lattice points in each replicate
+        num_replicates: number of random shifts
+        seed: seed for the random shifts
+        complement (bool): return 1 - P[Z_1 < b_1, ..., Z_m < b_m]
+
+    Returns:
+        p (float): probability
+        error (float): 3 standard errors of p
+    """
+    b = np.asarray(b, dtype=float)
+    m = len(b)
+    if m == 1:
+        if complement:
+            return stats.norm.sf(b[0]), 0.
+        return stats.norm.cdf(b[0]), 0.
+
+    # integrating the most restrictive limits first reduces the variance
+    order = np.argsort(b)
+    b = b[order]
+    rho = np.asarray(rho, dtype=float)[np.ix_(order, order)]
+    if complement:
+        events = [[i] + list(range(i)) for i in range(m)]
+    else:
+        events = [list(range(m))]
+    factors = [cholesky(rho[np.ix_(e, e)]) for e in events]
+
+    rng = np.random.default_rng(seed)
+    q = np.sqrt(_primes(m - 1))
+    k = np.arange(1, num_samples + 1)[:, None]
+    estimates = np.empty(num_replicates)
+    for r in range(num_replicates):
+        w = np.abs(2 * np.mod(k * q + rng.random(m - 1), 1) - 1)
+        estimates[r] = sum(_genz(b[e], L, w, tail=complement).mean()
+                           for e, L in zip(events, factors))
+    error = 3 * estimates.std(ddof=1) / np.sqrt(num_replicates)
+    return estimates.mean(), error
+
+
+def _genz(b, L, w, tail=False):
+    """Genz integrand of P[Z_1 < b_1, ...], or P[Z_1 > b_1, Z_2 < b_2, ...]
+    with tail, at the lattice points w"""
+    diag = np.maximum(np.diag(L), 1e-12)
+    if tail:
+        e = stats.norm.sf(b[0] / diag[0])
+    else:
+        e = stats.norm.cdf(b[0] / diag[0])
+    f = np.full(len(w), e)
+    y = np.zeros((len(w), len(b) - 1))
+    if len(b) > 1:
+        if tail:
+            y[:, 0] = stats.norm.isf(np.clip(w[:, 0] * e, 1e-300, 1))
+        else:
+            y[:, 0] = stats.norm.ppf(np.clip(w[:, 0] * e, 1e-300, 1 - 1e-16))
+    for i in range(1, len(b)):
+        e = stats.norm.cdf((b[i] - y[:, :i] @ L[i, :i]) / diag[i])
+        f *= e
+        if i < len(b) - 1:
+            y[:, i] = stats.norm.ppf(np.clip(w[:, i] * e, 1e-300, 1 - 1e-16))
+    return f
+
+
+def bivariate_normal_cdf(h, k, rho, num_points=20):
+    """Standard bivariate normal probability P[Z_1 < h, Z_2 < k]
+
+    Uses the integral in the correlation coefficient,
+
+        Phi2(h, k; rho) = Phi(h) Phi(k) + int_0^rho phi2(h, k; r) dr
+
+    with Gauss-Legendre quadrature. For |rho| > 1/2 the integral starts
+    from the limit rho = +-1 instead, where Phi2 is known, with
+    r = +-(1 - s**2) to remove the singularity of phi2. So the small
+    probabilities of nearly perfectly correlated pairs, e.g. of the
+    outcrossing rates, are accurate. h, k and rho are broadcast so all
+    pairs of a system are computed at once.
+
+    Args:
+        h, k (array): upper limits
+        rho (array): correlation coefficients
+        num_points: number of Gauss-Legendre points
+
+    Returns:
+        p (array): probabilities
+    """
+    h, k, rho = np.broadcast_arrays(*(np.asarray(a, dtype=float)
+                                      for a in (h, k, rho)))
+    rho = np.clip(rho, -1, 1)
+    t, w = np.polynomial.legendre.leggauss(num_points)
+    h_, k_ = h[..., None], k[..., None]
+
+    # nodes mapped from [-1, 1] to [0, rho]
+    r = np.clip(rho, -.5, .5)[..., None] * (t + 1) / 2
+    density = (np.exp(-(h_**2 - 2 * r * h_ * k_ + k_**2) / (2 * (1 - r**2)))
+               / (2 * np.pi * np.sqrt(1 - r**2)))
+    center = (stats.norm.cdf(h) * stats.norm.cdf(k)
+              + np.clip(rho, -.5, .5) / 2 * (density @ w))
+
+    # nodes mapped from [-1, 1] to [0, sqrt(1 - |rho|)]
+    sign = np.where(rho < 0, -1., 1.)
+    s_max = np.sqrt(1 - np.clip(abs(rho), .5, 1))
+    s = np.maximum(s_max[..., None] * (t + 1) / 2, 1e-100)
+    r = sign[..., None] * (1 - s**2)
+    density = (np.exp(-(h_**2 - 2 * r * h_ * k_ + k_**2)
+                      / (2 * s**2 * (2 - s**2)))
+               / (np.pi * np.sqrt(2 - s**2)))
+    integral = s_max / 2 * (density @ w)
+    tail = np.where(
+        rho < 0,
+        np.maximum(0, stats.norm.cdf(k) - stats.norm.cdf(-h)) + integral,
+        stats.norm.cdf(np.minimum(h, k)) - integral)
+    return np.where(abs(rho) > .5, tail, center)
+
+
+def ditlevsen_bounds(beta, rho):
+    """Ditlevsen bounds of the probability of failure of a series system
+
+    With the components ordered by decreasing P_i = Phi(-beta_i) and
+    P_ij = Phi2(-beta_i, -beta_j; rho_ij),
+
+        lower = P_1 + sum_i>1 max(0, P_i - sum_j<i P_ij)
+        upper = sum_i P_i - sum_i>1 max_j<i P_ij
+
+    Args:
+        beta (array): reliability index of each component
+        rho (array): correlation between components
+
+    Returns:
+        lower (float): lower bound
+        upper (float): upper bound
+    """
+    beta = np.asarray(beta, dtype=float)
+    order = np.argsort(beta)
+    beta = beta[order]
+    rho = np.asarray(rho, dtype=float)[np.ix_(order, order)]
+
+    P = stats.norm.cdf(-beta)
+    P_ij = np.tril(bivariate_normal_cdf(-beta[:, None], -beta[None, :], rho),
+                   -1)
+    lower = P[0] + np.sum(np.maximum(0, P[1:] - P_ij[1:].sum(axis=1)))
+    upper = P.sum() - np.sum(P_ij[1:].max(axis=1))
+    return lower, min(upper, 1.)
+
+
+def system_reliability(limit_states, X, system='series', processes=None,
+                       num_samples=10000, seed=None, **kwargs):
+    """Probability of failure of a series or parallel system with FORM
+
+    Each component g_i is linearized at its design point, so the system
+    probability of failure is a multivariate normal integral,
+
+        series:   pf = 1 - Phi_m(beta; rho)
+        parallel: pf = Phi_m(-beta; rho)
+
+    Args:
+        limit_states (list): component limit states g_i(X_1, ..., X_n)
+        X (object): random variables attributes of the stochastic model
+        system (str): 'series' or 'parallel'
+        processes: number of worker processes for the components FORM
+        num_samples: number of lattice points of multivariate_normal_cdf
+        seed: seed of multivariate_normal_cdf
+        **kwargs: options passed to form_ihlrf
+
+    Returns:
+        pf (float): system probability of failure
+        bounds (tuple): Ditlevsen bounds for series systems, for parallel
+            systems (0, min P_ij)
+        beta (array): reliability index of each component
+        rho (array): correlation between components
+    """
+    beta, rho, _ = components(limit_states, X, processes, **kwargs)
+    if system == 'series':
+        pf = multivariate_normal_cdf(beta, rho, num_samples, seed=seed,
+                                     complement=True)[0]
+        bounds = ditlevsen_bounds(beta, rho)
+    elif system == 'parallel':
+        pf = multivariate_normal_cdf(-beta, rho, num_samples, seed=seed)[0]
+        P_ij = bivariate_normal_cdf(-beta[:, None], -beta[None, :], rho)
+        bounds = (0., P_ij.min() if len(beta) > 1 else pf)
+    else:
+        raise ValueError('system {} not implemented'.format(system))
+    return pf, bounds, beta, rho
+
+
+def failure_probability(limit_states, X, num_simulations, system='series',
+                        chunk_size=100000, confidence=.95, seed=None,
+                        processes=None):
+    """Estimate the system probability of failure by Monte Carlo
+
+    All components are evaluated on the same chunk of samples, so the
+    samples are generated once for the whole system and the component
+    probabilities of failure come for free.
+
+    Args:
+        limit_states (list): component limit states g_i(X_1, ..., X_n)
+        X (object): random variables attributes of the stochastic model
+        num_simulations: number of simulations
+        system (str): 'series' or 'parallel'
+        chunk_size: number of samples generated at once
+        confidence: confidence level of the interval
+        seed: seed for the random number generator
+        processes: number of worker processes, None runs serially
+
+    Returns:
+        pf (float): system probability of failure
+        cov (float): coefficient of variation of pf
+        ci (tuple): (lower, upper) confidence interval of pf
+        pf_components (array): probability of failure of each component
+    """
+    if system not in ('series', 'parallel'):
+        raise ValueError('system {} not implemented'.format(system))
+    sizes = [chunk_size] * (num_simulations // chunk_size)
+    if num_simulations % chunk_size:
+        sizes.append(num_simulations % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    count = partial(_count_failures, limit_states, X, system=system)
+
+    if processes is None or processes == 1:
+        counts = list(map(count, sizes, seeds))
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            counts = list(pool.map(
+                count, sizes, seeds,
+                chunksize=max(1, len(sizes) // (4 * processes))))
+    num_failures = sum(c[0] for c in counts)
+    pf_components = sum(c[1] for c in counts) / num_simulations
+    return (_estimate(num_failures, num_simulations, confidence)
+            + (pf_components,))
+
+
+def _count_failures(limit_states, X, num_simulations, seed, system):
+    """Count system and component failures in one chunk"""
+    x = sample(X, num_simulations, np.random.default_rng(seed))
+    failed = np.column_stack([evaluate(g, x) < 0 for g in limit_states])
+    if system == 'series':
+        num_failures = np.count_nonzero(failed.any(axis=1))
+    else:
+        num_failures = np.count_nonzero(failed.all(axis=1))
+    return num_failures, failed.sum(axis=0)
+
+
+def _primes(n):
+    """First n prime numbers"""
+    primes = []
+    candidate = 2
+    while len(primes) < n:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return np.array(primes)
@@ -0,0 +1,43 @@
+import numpy as np
+from scipy import stats
+import pytest
+from ..akmcs import akmcs, Kriging
+from ..stochastic_model import StochasticModel
+
+
+def test_kriging_update():
+    x = np.random.default_rng(1).standard_normal((10, 2))
+    y = np.sin(x[:, 0]) + x[:, 1]**2
+    model = Kriging(x[:9], y[:9])
+    model.add(x[9], y[9])
+    refitted = Kriging(x, y, model.theta)
+    refitted.theta = model.theta
+    refitted._factor()
+    assert np.allclose(model.L, refitted.L)
+    mu, sig = model.predict(x)
+    assert np.allclose(mu, y, atol=1e-4)
+
+
+def test_akmcs():
+    def limit_state(x1, x2):
+        return x1 - x2
+
+    X = StochasticModel(['norm', 5, 1],
+                        ['norm', 2, 1])
+    pf, cov, num_calls = akmcs(limit_state, X, 20000, seed=1)
+    assert pytest.approx(pf, rel=.1) == stats.norm.cdf(-3/np.sqrt(2))
+    assert num_calls < 30
+
+
+def test_akmcs_nonlinear():
+    def limit_state(x1, x2):
+        return x1**3 + x2**3 - 18
+
+    X = StochasticModel(['norm', 10, 5],
+                        ['norm', 10, 5])
+    for learning in ['U', 'EFF']:
+        pf, cov, num_calls = akmcs(limit_state, X, 50000, learning=learning,
+                                   seed=2)
+        # crude Monte Carlo with 10**6 samples gives 0.00544
+        assert pytest.approx(pf, rel=.15) == 0.00544
+        assert num_calls < 100
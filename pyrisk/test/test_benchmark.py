@@ -0,0 +1,60 @@
+import json
+import numpy as np
+from scipy import stats
+import pytest
+from ..benchmark import Problem, run, main, problems, samplers
+from ..stochastic_model import StochasticModel
+
+
+def test_run():
+    records = run(['choi_linear', 'series_10d'],
+                  ['form_hlrf_choi', 'form_ihlrf', 'montecarlo'],
+                  num_simulations=2**14, sampler_names=[])
+    assert len(records) == 6
+    for record in records:
+        assert record['calls'] > 0
+        assert record['peak_memory'] > 0
+    choi = records[0]
+    assert choi['solver'] == 'form_hlrf_choi'
+    assert choi['beta_error'] < 1e-6
+    assert pytest.approx(problems()['choi_linear'].pf, rel=2e-3) == .1073
+
+
+def test_main_json(tmp_path):
+    output = tmp_path / 'results.json'
+    main(['--problems', 'nowak_beam', '--solvers', 'form_hl',
+          'form_hlrf_nowak', '--samplers', '--no-memory', '--output',
+          str(output)])
+    records = json.loads(output.read_text())
+    assert [r['solver'] for r in records] == ['form_hl', 'form_hlrf_nowak']
+    for record in records:
+        assert 'error' not in record
+        assert np.isfinite(record['beta'])
+        # FORM error of the linearization at the design point
+        assert record['pf_error'] < .06
+
+
+def test_samplers():
+    records = run(['choi_linear'], ['montecarlo'], num_simulations=2**16)
+    assert [r['sampler'] for r in records[1:]] == list(samplers)
+    for record in records[1:]:
+        assert record['num_simulations'] == 2**16
+        assert record['time'] > 0
+        assert record['peak_memory'] > 0
+        assert record['mean_error'] < 1e-2
+        assert record['std_error'] < 2e-2
+
+
+def quartic(x1, x2):
+    """Liu and Der Kiureghian (1991), HL-RF does not converge"""
+    return x1**4 + 2*x2**4 - 20
+
+
+def test_call_budget():
+    X = StochasticModel(['norm', 10, 5],
+                        ['norm', 10, 5])
+    problem = Problem('quartic', quartic, X, stats.norm.cdf(-2.3655))
+    choi, ihlrf = run([problem], ['form_hlrf_choi', 'form_ihlrf'],
+                      max_calls=1000, memory=False, sampler_names=[])
+    assert choi['error'] == 'more than 1000 limit state calls'
+    assert pytest.approx(ihlrf['beta'], rel=1e-3) == 2.3655
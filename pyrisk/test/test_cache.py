@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from ..cache import CachedLimitState
+from ..derivative import batched
+from ..form_hlrf_choi import form_hlrf_choi
+from ..stochastic_model import StochasticModel
+
+
+def test_cache_hits():
+    calls = []
+
+    def limit_state(x1, x2):
+        calls.append(np.size(x1))
+        return x1 - x2
+
+    g = CachedLimitState(limit_state)
+    assert g(3, 1) == 2
+    assert g(3, 1) == 2
+    assert np.allclose(g(np.array([3, 4, 3]), np.array([1, 1, 1])), [2, 3, 2])
+    assert g.hits == 3
+    assert g.misses == 2
+    assert calls == [1, 1]
+
+
+def test_cache_quantum_and_maxsize():
+    g = CachedLimitState(lambda x1: x1**2, quantum=1e-6, maxsize=2)
+    g(1.)
+    g(1. + 1e-9)
+    assert g.hits == 1
+    g(2.)
+    g(3.)
+    g(1.)
+    assert g.misses == 4
+
+
+def test_cache_sqlite(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    g = CachedLimitState(lambda x1, x2: x1 * x2, path=path)
+    g(np.array([1., 2.]), np.array([3., 4.]))
+
+    g = CachedLimitState(lambda x1, x2: np.nan, path=path)
+    assert g(2., 4.) == 8
+    assert g.misses == 0
+
+
+def test_cache_form():
+    def limit_state(x1, x2):
+        return x1**3 + x2**3 - 18
+
+    g = CachedLimitState(limit_state)
+    X = StochasticModel(['norm', 10, 5],
+                        ['norm', 10, 5])
+    x, beta, i = form_hlrf_choi(g, X, gradient=batched)
+    assert pytest.approx(beta, rel=1e-2) == 2.24
+    assert g.misses > 0
+
+
+def test_cache_scalar_limit_state_calls():
+    """A limit state returning a float, e.g. an external FE solve, is
+    called once for each missing point"""
+    calls = []
+
+    def fe(x1, x2):
+        calls.append((x1, x2))
+        return float(x1 - x2)
+
+    g = CachedLimitState(fe)
+    assert g(1., 2.) == -1
+    assert g(1., 2.) == -1
+    assert len(calls) == 1
+    assert g.misses == 1
+    assert g.hits == 1
@@ -1,5 +1,9 @@
+import numpy as np
 import pytest
-from ..derivative import derivative
+from ..derivative import (derivative, batched, forward, complex_step,
+                          analytic)
+from ..form_hlrf_choi import form_hlrf_choi
+from ..stochastic_model import StochasticModel
 
 
 def test_derivative():
@@ -10,3 +14,26 @@ def test_derivative():
     assert pytest.approx(d) == [2, 5]
 
 
+def test_gradient_providers():
+    def f(x1, x2):
+        return x1**3 + np.exp(x2)
+
+    exact = [3*1.5**2, np.exp(.5)]
+    assert pytest.approx(batched(f, [1.5, .5])) == exact
+    assert pytest.approx(forward(f, [1.5, .5]), rel=1e-6) == exact
+    assert pytest.approx(complex_step(f, [1.5, .5]), rel=1e-14) == exact
+
+    grad = analytic(lambda x1, x2: [3*x1**2, np.exp(x2)])
+    assert pytest.approx(grad(f, [1.5, .5])) == exact
+
+
+def test_form_analytic_gradient():
+    def limit_state(x1, x2):
+        return x1**3 + x2**3 - 18
+
+    grad = analytic(lambda x1, x2: [3*x1**2, 3*x2**2])
+    for gradient in [grad, complex_step]:
+        X = StochasticModel(['norm', 10, 5],
+                            ['norm', 10, 5])
+        x, beta, i = form_hlrf_choi(limit_state, X, gradient=gradient)
+        assert pytest.approx(beta, rel=1e-2) == 2.24
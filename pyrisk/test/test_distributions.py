@@ -0,0 +1,64 @@
+import numpy as np
+from scipy import stats
+from ..distributions import Normal, Lognormal, Gumbel, Tabulated
+from ..stochastic_model import StochasticModel
+from .. import montecarlo
+
+
+def test_distributions_match_scipy():
+    x = np.linspace(2, 30, 50)
+    p = np.linspace(.001, .999, 50)
+    X = StochasticModel(['norm', 10, 3],
+                        ['lognorm', 10, 3],
+                        ['gumbel_r', 10, 3])
+    for dist, scipy_dist in zip([Normal(10, 3), Lognormal(10, 3),
+                                 Gumbel(10, 3)], X.dist_func):
+        for method in ['pdf', 'logpdf', 'cdf', 'sf', 'ppf', 'isf']:
+            values = p if method in ['ppf', 'isf'] else x
+            assert np.allclose(getattr(dist, method)(values),
+                               getattr(scipy_dist, method)(values))
+        assert np.isclose(dist.mean(), scipy_dist.mean(), rtol=1e-4)
+        assert np.isclose(dist.std(), scipy_dist.std())
+
+
+def test_distributions_sample():
+    dist = Gumbel([10, 100], [3, 5])
+    x = dist.sample(100000, rng=1)
+    assert x.shape == (100000, 2)
+    assert np.allclose(x.mean(axis=0), [10, 100], rtol=1e-2)
+    assert np.allclose(x.std(axis=0), [3, 5], rtol=2e-2)
+
+    x = Lognormal(1, .1).sample(1000, rng=2)
+    ks = stats.kstest(x, 'lognorm', stats.lognorm.fit(x))
+    assert ks[1] > .05
+
+
+def test_lognormal_outside_support():
+    dist = Lognormal(1, .1)
+    assert np.allclose(dist.pdf(np.array([-1., 0.])), 0)
+    assert np.allclose(dist.cdf(np.array([-1., 0.])), 0)
+
+
+def test_tabulated():
+    def func(x):
+        return 2*(x-1)
+
+    dist = Tabulated(func, [1, 2])
+    assert np.allclose(dist.cdf(np.array([1, 1.5, 2])), [0, .25, 1])
+    assert np.allclose(dist.ppf(np.array([.25, 1])), [1.5, 2])
+    assert np.isclose(dist.mean(), 5/3)
+    assert np.isclose(dist.std()**2, 1/18, rtol=1e-4)
+
+    x = dist.sample(1000, rng=1)
+    assert stats.kstest(x, lambda x: (x - 1)**2)[1] > .05
+
+
+def test_tabulated_marginal():
+    X = StochasticModel([Tabulated(lambda x: 2*(x-1), [1, 2])],
+                        ['norm', 10, 3])
+    X = X.with_correlation(1, 2, .5)
+    assert np.allclose(X.mean, [5/3, 10], rtol=1e-4)
+
+    x = montecarlo.sample(X, 100000, rng=1)
+    assert np.allclose(x.mean(axis=0), [5/3, 10], rtol=1e-2)
+    assert np.isclose(np.corrcoef(x, rowvar=False)[0, 1], .5, atol=1e-2)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from ..form_hlrf_batch import form_hlrf_batch
+from ..form_hlrf_choi import form_hlrf_choi
+from ..stochastic_model import StochasticModel
+
+
+def test_form_hlrf_batch():
+    def limit_state(x1, x2):
+        return x1**3 + x2**3 - 18
+
+    mean = np.array([[10, 10],
+                     [10, 9.9],
+                     [12, 12]])
+    std = np.array([[5, 5],
+                    [5, 5],
+                    [4, 4]])
+
+    x, beta, i = form_hlrf_batch(limit_state, mean, std, tol=1e-5)
+    assert pytest.approx(beta[:2], rel=1e-2) == [2.24, 1.16]
+    assert np.allclose(limit_state(*x[[0, 2]].T), 0, atol=1e-4)
+
+    X = StochasticModel(['norm', 12, 4],
+                        ['norm', 12, 4])
+    _, beta_choi, _ = form_hlrf_choi(limit_state, X, tol=1e-5)
+    assert pytest.approx(beta[2], rel=1e-2) == beta_choi
+
+
+def test_form_hlrf_batch_linear():
+    def limit_state(x1, x2, x3):
+        """From choi 2007 p. 224"""
+        return x1 - x2 - 2*x3
+
+    mean = np.array([[50, 10, 15],
+                     [60, 10, 15]])
+    std = np.array([[5, 2, 3],
+                    [5, 2, 3]])
+
+    x, beta, i = form_hlrf_batch(limit_state, mean, std)
+    exact = (mean @ [1, -1, -2]) / np.sqrt(5**2 + 2**2 + 6**2)
+    assert pytest.approx(beta) == exact
+    assert np.all(i == 2)
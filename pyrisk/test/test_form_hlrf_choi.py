@@ -36,3 +36,20 @@ def test_form_hlrf_choi3():
     x, beta, i = form_hlrf_choi(limit_state, X)
     assert pytest.approx(beta, rel=1e-2) == 3.322
 
+
+def test_stochastic_model_not_modified():
+    def limit_state(x1, x2, x3):
+        return x2*x3 - 78.12*x1
+
+    X = StochasticModel(['gumbel_r', 4, 1],
+                        ['norm', 2e7, .5e7],
+                        ['norm', 1e-4, .2e-4])
+
+    x, beta, i = form_hlrf_choi(limit_state, X)
+    x, beta_again, i = form_hlrf_choi(limit_state, X)
+    assert list(X.mean) == [4, 2e7, 1e-4]
+    assert beta_again == beta
+
+    mean, std = X.equivalent_normal(x)
+    assert pytest.approx(mean[1:]) == [2e7, 1e-4]
+    assert pytest.approx(std[1:]) == [.5e7, .2e-4]
@@ -37,7 +37,7 @@ def test_form_hlrf_correlation3():
                         ['norm', 10, 2],
                         ['norm', 15, 3])
 
-    X.add_correlation(2, 3, .25)
+    X = X.with_correlation(2, 3, .25)
 
     x, beta, i = form_hlrf_correlation(limit_state, X, tol=1e-5)
     pf = stats.norm.cdf(-beta)
@@ -51,7 +51,7 @@ def test_form_hlrf_correlation4():
     X = StochasticModel(['norm', 16.6, 2.45],
                         ['norm', 18.8, 2.83])
 
-    X.add_correlation(1, 2, 2/(2.45*2.83))
+    X = X.with_correlation(1, 2, 2/(2.45*2.83))
 
     x, beta, i = form_hlrf_correlation(limit_state, X, tol=1e-5)
     print(beta)
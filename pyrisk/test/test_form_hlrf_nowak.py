@@ -1,5 +1,7 @@
+from scipy import stats
 import pytest
 from ..form_hlrf_nowak import form_hlrf_nowak
+from ..form_ihlrf import form_ihlrf
 from ..stochastic_model import StochasticModel
 
 
@@ -30,3 +32,26 @@ def test_form_hlrf_nowak2():
 
     x, beta, i = form_hlrf_nowak(limit_state, X, var_func)
     assert pytest.approx(beta, rel=1e-2) == 4.03
+
+
+def test_form_hlrf_nowak_beam():
+    """All normal Nowak beam, the design point is checked with form_ihlrf
+    and pf with conditional Monte Carlo with 2 10**7 samples"""
+    def limit_state(x1, x2, x3):
+        L = 5
+        return 1/360 - 0.00694*x3*L**4/(x2*x1)
+
+    def var_func(x1, x2, x3):
+        L = 5
+        return x2*x1/(L**4 * 360 * 0.00694)
+
+    X = StochasticModel(['norm', 8e-4, 1.4e-4],
+                        ['norm', 2e7, .5e7],
+                        ['norm', 10, .4])
+
+    x, beta, i = form_hlrf_nowak(limit_state, X, var_func)
+    assert i < 10
+    assert pytest.approx(limit_state(*x), abs=1e-12) == 0
+    assert pytest.approx(beta, rel=1e-2) == form_ihlrf(limit_state, X).beta
+    # error of the linearization at the design point
+    assert pytest.approx(stats.norm.cdf(-beta), rel=.06) == .49472
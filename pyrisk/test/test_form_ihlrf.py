@@ -0,0 +1,57 @@
+import numpy as np
+from scipy import optimize
+import pytest
+from ..form_ihlrf import form_ihlrf
+from ..derivative import batched
+from ..stochastic_model import StochasticModel
+
+
+def test_form_ihlrf():
+    def limit_state(x1, x2):
+        return x1**3 + x2**3 - 18
+
+    X = StochasticModel(['norm', 10, 5],
+                        ['norm', 10, 5])
+
+    result = form_ihlrf(limit_state, X)
+    assert result.converged
+    assert pytest.approx(result.beta, rel=1e-3) == 2.2401
+    assert pytest.approx(result.u, rel=1e-3) == result.beta * result.alpha
+    # one call per line search step and 2n calls per gradient
+    assert result.num_g >= 1 + len(result.history) + 4 * result.num_grad
+
+
+def test_form_ihlrf_nonlinear():
+    def limit_state(x1, x2):
+        return x1**3 + x2**3 - 18
+
+    X = StochasticModel(['norm', 10, 5],
+                        ['norm', 9.9, 5])
+
+    result = form_ihlrf(limit_state, X, gradient=batched)
+    assert result.converged
+    assert abs(result.g) < 1e-3
+
+    # shortest distance to g = 0 in the standard space
+    constraint = {'type': 'eq',
+                  'fun': lambda u: limit_state(*X.to_physical(u))}
+    u = optimize.minimize(lambda u: u @ u, result.u,
+                          constraints=[constraint]).x
+    assert pytest.approx(result.beta, rel=1e-3) == np.linalg.norm(u)
+
+
+def test_form_ihlrf_gumbel_warm_start():
+    def limit_state(x1, x2, x3):
+        return x2*x3 - 78.12*x1
+
+    X = StochasticModel(['gumbel_r', 4, 1],
+                        ['norm', 2e7, .5e7],
+                        ['norm', 1e-4, .2e-4])
+
+    result = form_ihlrf(limit_state, X)
+    assert pytest.approx(result.beta, rel=1e-2) == 3.322
+
+    warm = form_ihlrf(limit_state, X, u0=result.u)
+    assert warm.converged
+    assert warm.iterations == 1
+    assert warm.num_g < result.num_g
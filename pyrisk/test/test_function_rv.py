@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from ..function_rv import mean_variance
+
+
+def test_mean_variance_methods():
+    def func(x1, x2, x3):
+        return x1**2 + x2 + 0*x3
+
+    mean = np.array([2., 1., 0.])
+    cov = np.diag([.3**2, .5**2, 1.])
+    exact_mu = 2**2 + .3**2 + 1
+    exact_var = 4 * 2**2 * .3**2 + 2 * .3**4 + .5**2
+
+    mu, var = mean_variance(func, mean, cov)
+    assert pytest.approx(mu) == 5
+    assert pytest.approx(var, rel=1e-4) == 4 * 2**2 * .3**2 + .5**2
+
+    for method, options in [('sosm', {}),
+                            ('gauss_hermite', {'order': 3}),
+                            ('smolyak', {'level': 3}),
+                            ('unscented', {})]:
+        mu, var = mean_variance(func, mean, cov, method=method, **options)
+        assert pytest.approx(mu, rel=1e-6) == exact_mu
+        assert pytest.approx(var, rel=1e-4) == exact_var
+
+
+def test_mean_variance_correlated():
+    def func(x1, x2):
+        return np.exp(x1 + x2)
+
+    mean = np.array([0., 0.])
+    cov = np.array([[.04, .02],
+                    [.02, .09]])
+    s2 = cov.sum()
+    mu, var = mean_variance(func, mean, cov, method='smolyak', level=4)
+    assert pytest.approx(mu, rel=1e-6) == np.exp(s2/2)
+    assert pytest.approx(var, rel=1e-4) == (np.exp(s2) - 1)*np.exp(s2)
+
+
+def test_mean_variance_zero_variance():
+    def func(a, b):
+        return a**2 + b
+
+    mean = [1., 2.]
+    cov = np.diag([.04, 0.])
+    exact_mu = 1 + .04 + 2
+    exact_var = 4 * .04 + 2 * .04**2
+
+    mu, var = mean_variance(func, mean, cov)
+    assert pytest.approx((mu, var)) == (3, .16)
+    for method in ['sosm', 'gauss_hermite', 'smolyak', 'unscented']:
+        mu, var = mean_variance(func, mean, cov, method=method)
+        assert pytest.approx(mu, rel=1e-6) == exact_mu
+        assert pytest.approx(var, rel=1e-4) == exact_var
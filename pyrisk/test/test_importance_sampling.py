@@ -0,0 +1,33 @@
+import numpy as np
+from scipy import stats
+import pytest
+from ..importance_sampling import importance_sampling
+from ..form_hlrf_choi import form_hlrf_choi
+from ..stochastic_model import StochasticModel
+
+
+def test_importance_sampling():
+    def limit_state(x1, x2):
+        return x1 - x2
+
+    X = StochasticModel(['norm', 10, 1],
+                        ['norm', 3, 1])
+
+    pf, cov, ess = importance_sampling(limit_state, X, 4000, seed=1)
+    assert pytest.approx(pf, rel=1e-1) == stats.norm.cdf(-7/np.sqrt(2))
+    assert cov < .05
+    assert ess > 100
+
+
+def test_importance_sampling_design_point():
+    def limit_state(x1, x2):
+        return x1**3 + x2**3 - 18
+
+    x, beta, i = form_hlrf_choi(limit_state,
+                                StochasticModel(['norm', 10, 5],
+                                                ['norm', 10, 5]))
+    X = StochasticModel(['norm', 10, 5],
+                        ['norm', 10, 5])
+    pf, cov, ess = importance_sampling(limit_state, X, 4000, x=x, seed=2)
+    # crude Monte Carlo with 10**6 samples gives 0.00544, FORM 0.0125
+    assert pytest.approx(pf, rel=1e-1) == 0.00544
@@ -1,5 +1,7 @@
+import numpy as np
 import pytest
-from ..integral import trapezoidal
+from scipy import stats
+from ..integral import trapezoidal, integrate
 
 
 def test_trapezoidal():
@@ -10,7 +12,6 @@ def test_trapezoidal():
 
 
 def test_trapezoidal_inf2():
-    import numpy as np
     mu, sig = 1, 0.2
 
     def func(x):
@@ -19,3 +20,29 @@ def test_trapezoidal_inf2():
 
     P = trapezoidal(func, interval=['-inf', 'inf'], num_division=100)
     assert pytest.approx(P, 1e-4) == 1
+
+
+def test_integrate_rules():
+    mu, sig = 1, 0.2
+
+    def func(x):
+        return 1/(np.sqrt(2*np.pi) * sig)*(np.exp(-1/(2 * sig**2) *
+                                                  (x - mu)**2))
+
+    for rule in ['gauss', 'simpson', 'tanh_sinh']:
+        P, error = integrate(func, interval=['-inf', 'inf'], rule=rule)
+        assert pytest.approx(P, abs=1e-8) == 1
+        E, error = integrate(lambda x: x * func(x), [-np.inf, 2], rule=rule)
+        exact = mu * stats.norm.cdf((2 - mu) / sig) - sig**2 * func(2)
+        assert pytest.approx(E, abs=1e-8) == exact
+
+
+def test_integrate_singular():
+    for rule in ['gauss', 'tanh_sinh']:
+        integral, error = integrate(lambda x: 1/np.sqrt(x), [0, 1],
+                                    rule=rule, tol=1e-7, rtol=0)
+        assert pytest.approx(integral, abs=1e-6) == 2
+
+    integral, error = integrate(lambda x: (x > 100) * 20000 / x**3 * x,
+                                [100, 'inf'], rule='gauss')
+    assert pytest.approx(integral, rel=1e-8) == 200
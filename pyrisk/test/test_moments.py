@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from ..moments import moments, raw_moments, central_moments
+
+
+def test_moments():
+    def func(x):
+        return 2*(x-1)
+
+    E, var, skewness, kurtosis = moments(func, interval=[1, 2])
+    assert pytest.approx(E) == 5/3
+    assert pytest.approx(var) == 1/18
+    assert pytest.approx(skewness) == -2*np.sqrt(2)/5
+    assert pytest.approx(kurtosis) == 2.4
+
+
+def test_moments_normal():
+    mu, sig = 1, 0.2
+
+    def func(x):
+        return 1/(np.sqrt(2*np.pi) * sig)*(np.exp(-1/(2 * sig**2) *
+                                                  (x - mu)**2))
+
+    m = raw_moments(func, interval=['-inf', 'inf'], order=2)
+    assert pytest.approx(m) == [1, mu, mu**2 + sig**2]
+    m = central_moments(func, interval=['-inf', 'inf'], order=4)
+    assert pytest.approx(m, abs=1e-10) == [1, 0, sig**2, 0, 3*sig**4]
+
+    E, var, skewness, kurtosis = moments(func, ['-inf', 'inf'],
+                                         g=lambda x: np.exp(x))
+    assert pytest.approx(E) == np.exp(mu + sig**2/2)
+    assert pytest.approx(var) == (np.exp(sig**2) - 1)*np.exp(2*mu + sig**2)
@@ -2,6 +2,7 @@ from scipy import stats
 import numpy as np
 import pytest
 from .. import montecarlo
+from ..stochastic_model import StochasticModel
 
 
 np.random.seed(987654321)
@@ -45,3 +46,114 @@ def test_correlated():
                               num_simulations=1000)
     numpy_cov = np.cov(x, rowvar=False)
     assert np.allclose(numpy_cov, cov, rtol=1, atol=1)
+
+
+def test_failure_probability():
+    def limit_state(x1, x2, x3):
+        """From choi 2007 p. 224"""
+        return x1 - x2 - 2*x3
+
+    X = StochasticModel(['norm', 50, 5],
+                        ['norm', 10, 2],
+                        ['norm', 15, 3])
+
+    pf, cov, ci = montecarlo.failure_probability(limit_state, X, 200000,
+                                                 chunk_size=30000, seed=1)
+    assert pytest.approx(pf, rel=3e-2) == 0.1073
+    assert cov < .02
+    assert ci[0] < pf < ci[1]
+
+
+def test_failure_probability_scalar_limit_state():
+    def limit_state(x1, x2):
+        if x1 - x2 < 0:
+            return -1
+        return 1
+
+    X = StochasticModel(['norm', 3, 1],
+                        ['norm', 0, 1])
+
+    pf, cov, ci = montecarlo.failure_probability(limit_state, X, 20000,
+                                                 seed=2)
+    assert pytest.approx(pf, rel=1e-1) == stats.norm.cdf(-3/np.sqrt(2))
+
+
+def _limit_state_choi(x1, x2, x3):
+    """From choi 2007 p. 224, module level so it can be pickled"""
+    return x1 - x2 - 2*x3
+
+
+def test_failure_probability_processes():
+    X = StochasticModel(['norm', 50, 5],
+                        ['norm', 10, 2],
+                        ['norm', 15, 3])
+
+    serial = montecarlo.failure_probability(_limit_state_choi, X, 50000,
+                                            chunk_size=7000, seed=3)
+    parallel = montecarlo.failure_probability(_limit_state_choi, X, 50000,
+                                              chunk_size=7000, seed=3,
+                                              processes=2)
+    assert serial == parallel
+    assert pytest.approx(serial[0], rel=5e-2) == 0.1073
+
+
+def test_mc_normal_rng():
+    x1 = montecarlo.normal(100, 0, 1, rng=5)
+    x2 = montecarlo.normal(100, 0, 1, rng=np.random.default_rng(5))
+    assert np.array_equal(x1, x2)
+
+
+@pytest.mark.parametrize('method', ['sobol', 'halton', 'lhs'])
+def test_quasi_random_samplers(method):
+    x = montecarlo.normal(1024, 10, 2, rng=0, method=method)
+    assert pytest.approx(x.mean(), abs=1e-2) == 10
+    assert pytest.approx(x.std(), rel=1e-2) == 2
+
+    x = montecarlo.lognormal(1024, 10, 2, rng=0, method=method)
+    assert pytest.approx(x.mean(), rel=1e-2) == 10
+
+    x = montecarlo.gumbel_r(1024, 10, 2, rng=0, method=method)
+    assert pytest.approx(x.mean(), rel=1e-2) == 10
+
+    cov = np.array([[1, .5*3*1],
+                    [.5*3*1, 3**2]])
+    x = montecarlo.correlated(['norm', 10, 1],
+                              ['norm', 15, 3],
+                              cov=cov,
+                              num_simulations=1024, rng=0, method=method)
+    assert np.allclose(np.cov(x, rowvar=False), cov, rtol=5e-2, atol=5e-2)
+
+
+def test_latin_hypercube_strata():
+    u = montecarlo._uniform(100, 0, 'lhs', d=3)
+    # one point in each of the 100 strata of each variable
+    assert np.all(np.sort(np.floor(u * 100), axis=0).T == np.arange(100))
+
+
+def test_failure_probability_sobol_chunks():
+    X = StochasticModel(['norm', 50, 5],
+                        ['norm', 10, 2],
+                        ['norm', 15, 3])
+    # chunks are consecutive blocks of the same sequence
+    one = montecarlo.failure_probability(_limit_state_choi, X, 2**14,
+                                         chunk_size=2**14, seed=4,
+                                         method='sobol')
+    chunked = montecarlo.failure_probability(_limit_state_choi, X, 2**14,
+                                             chunk_size=2**11, seed=4,
+                                             method='sobol')
+    assert one == chunked
+    assert pytest.approx(one[0], rel=2e-2) == 0.1073
+
+
+def test_expectation_replicates():
+    X = StochasticModel(['norm', 10, 2],
+                        ['lognorm', 5, 1])
+
+    def func(x1, x2):
+        return x1 * x2
+
+    mean, error = montecarlo.expectation(func, X, 1024, seed=5)
+    _, error_random = montecarlo.expectation(func, X, 1024, seed=5,
+                                             method='random')
+    assert pytest.approx(mean, abs=3 * error) == 50
+    assert error < error_random / 10
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from ..nataf import cholesky
+from ..stochastic_model import StochasticModel
+from .. import montecarlo
+
+
+def test_nataf_normal():
+    X = StochasticModel(['norm', 10, 1],
+                        ['norm', 15, 3])
+    X = X.with_correlation(1, 2, .5)
+    rho_z, L = X.nataf()
+    assert np.allclose(rho_z, X.rho)
+    assert np.allclose(L @ L.T, X.rho)
+
+
+def test_nataf_lognormal():
+    """rho_z = ln(1 + rho d1 d2)/sqrt(ln(1 + d1**2) ln(1 + d2**2))"""
+    X = StochasticModel(['lognorm', 10, 3],
+                        ['lognorm', 20, 8])
+    X = X.with_correlation(1, 2, .6)
+    rho_z, _ = X.nataf()
+    d1, d2 = .3, .4
+    exact = (np.log(1 + .6 * d1 * d2)
+             / np.sqrt(np.log(1 + d1**2) * np.log(1 + d2**2)))
+    assert pytest.approx(rho_z[0, 1], rel=1e-4) == exact
+
+
+def test_sample_correlated_non_normal():
+    X = StochasticModel(['lognorm', 10, 3],
+                        ['gumbel_r', 20, 4])
+    X = X.with_correlation(1, 2, .5)
+    x = montecarlo.sample(X, 200000, rng=1)
+    assert pytest.approx(np.corrcoef(x, rowvar=False)[0, 1], abs=1e-2) == .5
+    assert pytest.approx(x.mean(axis=0), rel=1e-2) == [10, 20]
+
+
+def test_cholesky_singular():
+    rho = np.array([[1, 1],
+                    [1, 1]])
+    L = cholesky(rho)
+    assert np.allclose(L @ L.T, rho, atol=1e-4)
+
+
+def test_transform_round_trip():
+    X = StochasticModel(['lognorm', 10, 3],
+                        ['gumbel_r', 20, 4],
+                        ['norm', 5, 1])
+    X = X.with_correlation(1, 2, .3)
+    u = np.random.default_rng(1).standard_normal((50, 3))
+    x = X.to_physical(u)
+    assert np.allclose(X.to_standard(x), u)
+    assert np.allclose(X.to_physical(u[0]), x[0])
+
+
+def test_with_correlation_new_model():
+    X = StochasticModel(['lognorm', 10, 3],
+                        ['norm', 5, 1])
+    rho_z, _ = X.nataf()
+    Y = X.with_correlation(1, 2, .3)
+    assert Y is not X
+    assert np.allclose(X.rho, np.eye(2))
+    assert np.allclose(X.nataf()[0], rho_z)
+    assert Y.rho[0, 1] == Y.rho[1, 0] == .3
+    assert isinstance(Y.dist_func, tuple)
+    with pytest.raises(ValueError):
+        X.rho[0, 1] = .3
+    with pytest.warns(DeprecationWarning), pytest.raises(TypeError):
+        X.add_correlation(1, 2, .3)
+    assert np.allclose(X.rho, np.eye(2))
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from ..pce import PolynomialChaos
+from ..stochastic_model import StochasticModel
+
+
+def test_pce_hermite():
+    def limit_state(x1, x2):
+        return x1 + x2**2
+
+    X = StochasticModel(['norm', 1, .5],
+                        ['norm', 2, 1])
+    pce = PolynomialChaos(X, degree=2).train(limit_state, 50, seed=1)
+
+    assert pytest.approx(pce.mean) == 1 + 2**2 + 1
+    variance = .5**2 + 4 * 2**2 + 2
+    assert pytest.approx(pce.variance) == variance
+    first, total = pce.sobol()
+    assert pytest.approx(first) == [.5**2 / variance, 18 / variance]
+    assert pytest.approx(total) == first
+    assert pytest.approx(pce(1., 3.)) == 10
+    assert pytest.approx(pce(np.array([1., 0.]), 3.)) == [10, 9]
+
+
+def test_pce_ishigami_lars():
+    def ishigami(x1, x2, x3):
+        return np.sin(x1) + 7*np.sin(x2)**2 + .1*x3**4*np.sin(x1)
+
+    X = StochasticModel(['uniform', -np.pi, 2*np.pi],
+                        ['uniform', -np.pi, 2*np.pi],
+                        ['uniform', -np.pi, 2*np.pi])
+    pce = PolynomialChaos(X, degree=9).train(ishigami, 300, method='lars',
+                                             seed=2)
+    first, total = pce.sobol()
+    assert pytest.approx(pce.mean, abs=5e-2) == 3.5
+    assert pytest.approx(first, abs=3e-2) == [.3139, .4424, 0]
+    assert pytest.approx(total, abs=3e-2) == [.5576, .4424, .2437]
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from ..random_field import RandomField, correlation_matrix
+from ..form_ihlrf import form_ihlrf
+
+
+def test_eigsh_dense():
+    x = np.linspace(0, 1, 200)
+    dense = RandomField(x, 10, 2, length=.5, n_terms=10, method='dense')
+    lanczos = RandomField(x, 10, 2, length=.5, n_terms=10)
+    assert pytest.approx(lanczos.eigval, rel=1e-8) == dense.eigval
+    assert np.allclose(abs(lanczos.basis), abs(dense.basis))
+
+
+def test_energy_truncation():
+    x = np.linspace(0, 1, 200)
+    field = RandomField(x, 10, 2, 'gaussian', length=.3, energy=.99)
+    assert field.eigval.sum() / 200 >= .99
+    assert field.eigval[:-1].sum() / 200 < .99
+    # the truncated variance
+    assert np.all(np.sum(field.basis**2, axis=1) <= 1 + 1e-10)
+
+
+def test_energy_more_than_100_terms():
+    x = np.linspace(0, 1, 500)
+    field = RandomField(x, 10, 2, length=.005, energy=.9)
+    dense = RandomField(x, 10, 2, length=.005, energy=.9, method='dense')
+    assert field.n_terms > 100
+    assert field.n_terms == dense.n_terms
+    assert field.eigval.sum() / 500 >= .9
+
+
+def test_nystrom_large_mesh():
+    rng = np.random.default_rng(0)
+    coords = rng.random((10000, 2))
+    field = RandomField(coords, 10, 2, 'gaussian', length=.5, n_terms=20,
+                        method='nystrom', num_points=400, seed=1)
+    assert field.basis.shape == (10000, 20)
+    # correlation of the truncated field at a few points
+    index = [0, 1, 2, 3]
+    rho = field.basis[index] @ field.basis[index].T
+    exact = correlation_matrix(coords[index], coords[index], 'gaussian', .5)
+    assert np.allclose(rho, exact, atol=3e-3)
+
+
+def test_realizations():
+    x = np.linspace(0, 1, 50)
+    field = RandomField(x, 10, 2, length=.2, n_terms=30, dist='lognorm')
+    h = field.sample(20000, rng=2)
+    assert h.shape == (20000, 50)
+    assert pytest.approx(h.mean(axis=0), rel=2e-2) == 10
+    assert pytest.approx(h[:, 10].std(), rel=5e-2) == 2 * np.sqrt(
+        np.sum(field.basis[10]**2))
+
+
+def test_form_random_field():
+    x = np.linspace(0, 1, 100)
+    field = RandomField(x, 10, 1, length=.3, n_terms=10)
+    X = field.stochastic_model()
+
+    def limit_state(*xi):
+        """Mean of the field larger than 8"""
+        return np.mean(field.realize(np.array(xi))) - 8
+
+    form = form_ihlrf(limit_state, X)
+    # the mean of the field is normal
+    std = np.sqrt(np.sum(field.basis.mean(axis=0)**2))
+    assert pytest.approx(form.beta, rel=1e-4) == 2 / std
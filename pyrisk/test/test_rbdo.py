@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from ..rbdo import rbdo, inverse_form
+from ..form_ihlrf import form_ihlrf
+from ..stochastic_model import StochasticModel
+
+
+def g1(x1, x2):
+    return x1**2 * x2 / 20 - 1
+
+
+def g2(x1, x2):
+    return (x1 + x2 - 5)**2 / 30 + (x1 - x2 - 12)**2 / 120 - 1
+
+
+def g3(x1, x2):
+    return 80 / (x1**2 + 8 * x2 + 5) - 1
+
+
+def model(d):
+    return StochasticModel(['norm', d[0], .3],
+                           ['norm', d[1], .3])
+
+
+def cost(d):
+    return d[0] + d[1]
+
+
+def test_inverse_form():
+    def limit_state(x1, x2):
+        return x1 - x2
+
+    X = StochasticModel(['norm', 10, 2],
+                        ['norm', 4, 1])
+    result = inverse_form(limit_state, X, 2)
+    # linear limit state, g_p = mu_g - beta sig_g
+    assert pytest.approx(result.g) == 6 - 2 * np.sqrt(5)
+    assert pytest.approx(np.linalg.norm(result.u)) == 2
+
+    # warm start from the most probable point
+    warm = inverse_form(limit_state, X, 2, u0=result.u)
+    assert warm.num_g < result.num_g
+
+
+@pytest.mark.parametrize('method', ['sora', 'double_loop'])
+def test_rbdo(method):
+    """Youn and Choi (2004) mathematical example, beta_target = 3"""
+    d, performance, num_g = rbdo(cost, [g1, g2, g3], model, [5, 5], 3,
+                                 bounds=[(0, 10)] * 2, method=method)
+    assert pytest.approx(d, rel=1e-3) == [3.439, 3.287]
+    assert np.all(performance > -1e-4)
+    beta = [form_ihlrf(g, model(d)).beta for g in (g1, g2)]
+    assert pytest.approx(beta, rel=1e-3) == [3, 3]
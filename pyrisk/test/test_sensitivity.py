@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from ..sensitivity import sobol_indices, importance_factors
+from ..stochastic_model import StochasticModel
+
+
+def ishigami(x1, x2, x3):
+    return np.sin(x1) + 7 * np.sin(x2)**2 + .1 * x3**4 * np.sin(x1)
+
+
+def test_sobol_indices_ishigami():
+    # uniform [-pi, pi] variables, scipy loc and scale
+    X = StochasticModel(*[['uniform', -np.pi, 2 * np.pi]] * 3)
+    S, ST, S_ci, ST_ci = sobol_indices(ishigami, X, 2**13, seed=0,
+                                       chunk_size=5000)
+    assert pytest.approx(S, abs=3e-2) == [.3139, .4424, 0]
+    assert pytest.approx(ST, abs=3e-2) == [.5576, .4424, .2437]
+    assert np.all(S_ci[0] < S) and np.all(S < S_ci[1])
+    assert np.all(ST_ci[0] < ST) and np.all(ST < ST_ci[1])
+
+
+def _linear(x1, x2, x3):
+    """Module level so it can be pickled"""
+    return x1 + 2 * x2 + 3 * x3
+
+
+def test_sobol_indices_processes():
+    X = StochasticModel(['norm', 0, 1],
+                        ['norm', 0, 1],
+                        ['norm', 0, 1])
+    serial = sobol_indices(_linear, X, 1024, seed=1, chunk_size=700)
+    parallel = sobol_indices(_linear, X, 1024, seed=1, chunk_size=700,
+                             processes=2)
+    for a, b in zip(serial, parallel):
+        assert np.array_equal(a, b)
+    assert pytest.approx(serial[1], abs=2e-2) == np.array([1, 4, 9]) / 14
+
+
+def test_importance_factors():
+    def limit_state(x1, x2, x3):
+        return 10 - x1 - 2 * x2 - 3 * x3
+
+    X = StochasticModel(['norm', 0, 1],
+                        ['norm', 0, 1],
+                        ['norm', 0, 1])
+    importance, x = importance_factors(limit_state, X)
+    assert pytest.approx(importance, rel=1e-3) == np.array([1, 4, 9]) / 14
+    assert pytest.approx(sum(importance)) == 1
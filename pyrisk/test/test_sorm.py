@@ -0,0 +1,65 @@
+from scipy import stats
+import pytest
+from ..sorm import sorm
+from ..form_ihlrf import form_ihlrf
+from ..integral import integrate
+from ..stochastic_model import StochasticModel
+
+
+def test_sorm_paraboloid():
+    beta, kappa = 3, .2
+
+    def limit_state(x1, x2, x3):
+        return beta - x3 + kappa/2 * (x1**2 + x2**2)
+
+    X = StochasticModel(['norm', 0, 1],
+                        ['norm', 0, 1],
+                        ['norm', 0, 1])
+    form = form_ihlrf(limit_state, X)
+
+    # P[u3 > beta + kappa/2 r**2], r**2 is chi-square with 2 dof
+    exact, _ = integrate(lambda r2: stats.chi2.pdf(r2, 2)
+                         * stats.norm.sf(beta + kappa/2 * r2), [0, 'inf'])
+
+    for method in ['curvature', 'point_fitting']:
+        breitung, hohenbichler, tvedt, k = sorm(limit_state, X, form,
+                                                method=method)
+        assert pytest.approx(k, rel=1e-3) == [kappa, kappa]
+        assert pytest.approx(breitung) == stats.norm.cdf(-3) / (1 + 3*kappa)
+        assert pytest.approx(tvedt, rel=2e-2) == exact
+        assert pytest.approx(hohenbichler, rel=5e-2) == exact
+
+
+def test_sorm_non_normal_design_point():
+    def limit_state(r, s):
+        return r - s - 1
+
+    X = StochasticModel(['lognorm', 10, 2],
+                        ['gumbel_r', 5, 1])
+    form = form_ihlrf(limit_state, X)
+    curvature = sorm(limit_state, X, form)
+    # the design point alone, e.g. from form_hlrf_correlation
+    design_point = sorm(limit_state, X, x=form.x)
+    fitting = sorm(limit_state, X, form, method='point_fitting')
+
+    assert pytest.approx(design_point[:3], rel=1e-3) == curvature[:3]
+    assert pytest.approx(fitting[2], rel=1e-2) == curvature[2]
+    # crude Monte Carlo with 2 10**6 samples gives 0.02685
+    assert pytest.approx(curvature[2], rel=3e-2) == 0.02685
+
+
+def test_sorm_curvature_one_call():
+    calls = []
+
+    def limit_state(x1, x2, x3):
+        calls.append(1)
+        return 3 - x3 + .1 * (x1**2 + x2**2)
+
+    X = StochasticModel(['norm', 0, 1],
+                        ['norm', 0, 1],
+                        ['norm', 0, 1])
+    form = form_ihlrf(limit_state, X)
+    del calls[:]
+    k = sorm(limit_state, X, form)[3]
+    assert len(calls) == 1
+    assert pytest.approx(k, rel=1e-3) == [.2, .2]
@@ -0,0 +1,31 @@
+import numpy as np
+from scipy import stats
+import pytest
+from ..subset_simulation import subset_simulation
+from ..stochastic_model import StochasticModel
+
+
+def test_subset_simulation():
+    def limit_state(x1, x2):
+        return x1 - x2
+
+    X = StochasticModel(['norm', 10, 1],
+                        ['norm', 3, 1])
+
+    pf, levels, cov = subset_simulation(limit_state, X, 5000, seed=0)
+    assert pytest.approx(pf, rel=.5) == stats.norm.cdf(-7/np.sqrt(2))
+    assert levels[-1] == 0
+    assert np.all(np.diff(levels) < 0)
+    assert cov < .6
+
+
+def test_subset_simulation_nonlinear():
+    def limit_state(x1, x2):
+        return x1**3 + x2**3 - 18
+
+    X = StochasticModel(['norm', 10, 5],
+                        ['norm', 10, 5])
+
+    pf, levels, cov = subset_simulation(limit_state, X, 2000, seed=2)
+    # crude Monte Carlo with 10**6 samples gives 0.00544
+    assert pytest.approx(pf, rel=.3) == 0.00544
@@ -0,0 +1,92 @@
+import numpy as np
+from scipy import stats
+import pytest
+from ..system import (bivariate_normal_cdf, multivariate_normal_cdf,
+                      ditlevsen_bounds, system_reliability,
+                      failure_probability)
+from ..stochastic_model import StochasticModel
+
+
+def g1(x1, x2):
+    return 3 - x1
+
+
+def g2(x1, x2):
+    return 3 - (x1 + x2) / np.sqrt(2)
+
+
+def g3(x1, x2):
+    return 3.2 - x2
+
+
+def test_bivariate_normal_cdf():
+    h = np.array([-1., 0., 2.])
+    k = np.array([.5, -2., 1.])
+    rho = np.array([-.7, .3, .95])
+    exact = [stats.multivariate_normal.cdf([hi, ki], cov=[[1, r], [r, 1]])
+             for hi, ki, r in zip(h, k, rho)]
+    assert pytest.approx(bivariate_normal_cdf(h, k, rho), abs=1e-6) == exact
+
+
+def test_multivariate_normal_cdf():
+    rho = np.array([[1, .5, .3, .2],
+                    [.5, 1, .4, .1],
+                    [.3, .4, 1, .6],
+                    [.2, .1, .6, 1]])
+    b = np.array([.5, 1., -.3, 2.])
+    p, error = multivariate_normal_cdf(b, rho, seed=0)
+    exact = stats.multivariate_normal.cdf(b, cov=rho)
+    assert error < 1e-3
+    assert pytest.approx(p, abs=1e-3) == exact
+
+
+def test_series_system():
+    X = StochasticModel(['norm', 0, 1],
+                        ['norm', 0, 1])
+    limit_states = [g1, g2, g3]
+    pf, (lower, upper), beta, rho = system_reliability(limit_states, X,
+                                                       seed=0)
+    assert pytest.approx(beta, rel=1e-4) == [3, 3, 3.2]
+    assert pytest.approx(rho[0, 1], rel=1e-4) == 1 / np.sqrt(2)
+
+    # linear limit states, FORM is exact
+    pf_mc, cov, ci, pf_components = failure_probability(
+        limit_states, X, 2000000, seed=0)
+    assert pytest.approx(pf_components[0], rel=.1) == stats.norm.cdf(-3)
+    assert ci[0] < pf_mc < ci[1]
+    assert pytest.approx(pf, rel=3e-2) == pf_mc
+    assert pytest.approx(pf, rel=3e-2) == lower
+    assert pytest.approx(ditlevsen_bounds(beta, rho), rel=1e-12) == (
+        lower, upper)
+
+
+def test_parallel_system():
+    X = StochasticModel(['norm', 0, 1],
+                        ['norm', 0, 1])
+    pf, bounds, beta, rho = system_reliability([g1, g3], X, 'parallel')
+    # independent components
+    exact = stats.norm.cdf(-3) * stats.norm.cdf(-3.2)
+    assert pytest.approx(pf, rel=1e-6) == exact
+    assert bounds[0] <= pf <= bounds[1]
+
+
+def test_series_system_small_pf():
+    rho = np.array([[1, .7, .3],
+                    [.7, 1, .2],
+                    [.3, .2, 1]])
+    alpha = np.linalg.cholesky(rho)
+    X = StochasticModel(*[['norm', 0, 1]] * 3)
+    for b in ([5, 5, 5.2], [6, 6, 6.2]):
+        limit_states = [lambda *u, a=a, b=bi: b - a @ np.array(u)
+                        for a, bi in zip(alpha, b)]
+        pf, (lower, upper), beta, rho_form = system_reliability(
+            limit_states, X, seed=0)
+        assert pytest.approx(beta, rel=1e-4) == b
+        assert pytest.approx(rho_form, abs=1e-4) == rho
+        # the bounds are 1e-7 apart, within the lattice error
+        assert lower * (1 - 1e-5) <= pf <= upper * (1 + 1e-5)
+
+    p, error = multivariate_normal_cdf(b, rho, seed=0, complement=True)
+    lower, upper = ditlevsen_bounds(b, rho)
+    assert error < 1e-5 * p
+    assert lower * (1 - 1e-5) <= p <= upper * (1 + 1e-5)
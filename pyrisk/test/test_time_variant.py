@@ -0,0 +1,49 @@
+import numpy as np
+from scipy import stats
+import pytest
+from ..time_variant import phi2, outcrossing_rate
+from ..stochastic_model import StochasticModel
+
+
+def _gaussian(dt):
+    """Autocorrelation with correlation length 1"""
+    return np.exp(- dt**2)
+
+
+def _stationary(s, t):
+    return 3 - s
+
+
+def _degradation(r, s, t):
+    return r * (1 - .01 * t) - s
+
+
+def test_outcrossing_rate_rice():
+    X = StochasticModel(['norm', 0, 1])
+    nu, form_t, form_dt = outcrossing_rate(_stationary, X, 0, 1e-3,
+                                           {0: _gaussian})
+    # Rice formula of a stationary gaussian process
+    rice = np.sqrt(2) / (2 * np.pi) * np.exp(- 3**2 / 2)
+    assert pytest.approx(nu, rel=1e-3) == rice
+    assert pytest.approx(form_t.beta) == 3
+
+
+def test_phi2_stationary():
+    X = StochasticModel(['norm', 0, 1])
+    times = np.linspace(0, 10, 5)
+    pf, nu, beta = phi2(_stationary, X, times, {0: _gaussian})
+    rice = np.sqrt(2) / (2 * np.pi) * np.exp(- 3**2 / 2)
+    assert pytest.approx(pf[-1], rel=1e-3) == stats.norm.cdf(-3) + 10 * rice
+
+
+def test_phi2_processes():
+    X = StochasticModel(['norm', 5, .5],
+                        ['gumbel_r', 1, .3])
+    times = np.linspace(0, 50, 8)
+    serial = phi2(_degradation, X, times, {1: _gaussian}, dt=1e-3)
+    parallel = phi2(_degradation, X, times, {1: _gaussian}, dt=1e-3,
+                    processes=2)
+    assert pytest.approx(parallel[0], rel=1e-4) == serial[0]
+    # the resistance decreases with time
+    assert np.all(np.diff(serial[2]) < 0)
+    assert np.all(np.diff(serial[0]) > 0)
@@ -0,0 +1,125 @@
+"""This module computes time variant reliability with the PHI2 method"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
+from scipy import stats
+from .form_ihlrf import form_ihlrf
+from .system import bivariate_normal_cdf
+
+
+class _AtTime(object):
+    """Limit state g(X_1, ..., X_n, t) at a fixed time t"""
+    def __init__(self, limit_state, t):
+        self.limit_state = limit_state
+        self.t = t
+
+    def __call__(self, *x):
+        return self.limit_state(*x, self.t)
+
+
+def outcrossing_rate(limit_state, X, t, dt, autocorrelation, u0=None,
+                     **kwargs):
+    """Outcrossing rate at t with the PHI2 method
+
+    The outcrossing rate is the probability of being safe at t and
+    failed at t + dt, a parallel system of two limit states linearized
+    with FORM at each instant,
+
+       nu(t) = Phi2(beta(t), -beta(t + dt); rho) / dt
+       rho = - alpha(t) @ C @ alpha(t + dt)
+
+    where C is diagonal with the autocorrelation coefficient of each
+    stochastic process variable at lag dt and one for the time invariant
+    random variables. The FORM at t + dt starts from the design point at
+    t.
+
+    Args:
+        limit_state (function): g(X_1, ..., X_n, t)
+        X (object): random variables attributes of the stochastic model,
+            the marginals of the stochastic processes
+        t (float): time
+        dt (float): time increment, small compared to the correlation
+            length of the processes
+        autocorrelation (dict): {index of the variable in X: function of
+            the lag returning the autocorrelation coefficient}
+        u0 (array): starting point of the FORM at t
+        **kwargs: options passed to form_ihlrf
+
+    Returns:
+        nu (float): outcrossing rate
+        form_t (object): FormResult at t
+        form_dt (object): FormResult at t + dt
+    """
+    form_t = form_ihlrf(_AtTime(limit_state, t), X, u0=u0, **kwargs)
+    form_dt = form_ihlrf(_AtTime(limit_state, t + dt), X, u0=form_t.u,
+                         **kwargs)
+    c = np.ones(len(form_t.alpha))
+    for i, rho_func in autocorrelation.items():
+        c[i] = rho_func(dt)
+    rho = - form_t.alpha @ (c * form_dt.alpha)
+    nu = bivariate_normal_cdf(form_t.beta, - form_dt.beta, rho) / dt
+    return nu, form_t, form_dt
+
+
+def phi2(limit_state, X, times, autocorrelation, dt=None, processes=None,
+         **kwargs):
+    """Cumulative probability of failure of g(X, t) with the PHI2 method
+
+    The upper bound of the probability of failure in [t_0, t] is the
+    probability of failure at t_0 plus the expected number of
+    outcrossings,
+
+       pf(t_0, t) = Phi(-beta(t_0)) + int_t_0^t nu(tau) dtau
+
+    integrated with the trapezoidal rule on times. The times are split
+    in consecutive blocks, one per worker process, and inside a block
+    the FORM at each time starts from the design point of the previous
+    time. With processes the limit state, X and the autocorrelation
+    functions must be picklable, e.g. defined at module level.
+
+    Args:
+        limit_state (function): g(X_1, ..., X_n, t)
+        X (object): random variables attributes of the stochastic model
+        times (array): increasing times
+        autocorrelation (dict): {index of the variable in X: function of
+            the lag returning the autocorrelation coefficient}
+        dt (float): time increment of the outcrossing rate, if None
+            1e-3 of the time span
+        processes: number of worker processes, None runs serially
+        **kwargs: options passed to form_ihlrf
+
+    Returns:
+        pf (array): cumulative probability of failure at each time
+        nu (array): outcrossing rate at each time
+        beta (array): reliability index at each time
+    """
+    times = np.asarray(times, dtype=float)
+    if dt is None:
+        dt = 1e-3 * (times[-1] - times[0])
+    block = partial(_phi2_block, limit_state, X, dt=dt,
+                    autocorrelation=autocorrelation, **kwargs)
+    if processes is None or processes == 1:
+        results = [block(times)]
+    else:
+        blocks = np.array_split(times, processes)
+        with ProcessPoolExecutor(processes) as pool:
+            results = list(pool.map(block, blocks))
+    nu = np.concatenate([r[0] for r in results])
+    beta = np.concatenate([r[1] for r in results])
+
+    expected = np.concatenate(
+        [[0], np.cumsum(np.diff(times) * (nu[1:] + nu[:-1]) / 2)])
+    pf = np.minimum(stats.norm.cdf(- beta[0]) + expected, 1)
+    return pf, nu, beta
+
+
+def _phi2_block(limit_state, X, times, dt, autocorrelation, **kwargs):
+    """Outcrossing rates of consecutive times with warm started FORM"""
+    nu, beta = np.empty(len(times)), np.empty(len(times))
+    u0 = None
+    for i, t in enumerate(times):
+        nu[i], form_t, _ = outcrossing_rate(limit_state, X, t, dt,
+                                            autocorrelation, u0, **kwargs)
+        beta[i] = form_t.beta
+        u0 = form_t.u
+    return nu, beta
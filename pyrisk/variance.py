@@ -9,12 +9,13 @@ def variance(func, interval=[0, 1], num_division=10, g=None):
         var (float): variance result
     """
 
+    # expected value computed once, not at each integration point
+    E = mean(func, interval, num_division, g)
+
     def xx_func(x):
         if g is not None:
-            Eg = mean(func, interval, num_division, g)
-            return (g(x) - Eg)**2 * func(x)
+            return (g(x) - E)**2 * func(x)
         else:
-            E = mean(func, interval, num_division)
             return (x - E)**2 * func(x)
 
     var = trapezoidal(xx_func, interval, num_division)